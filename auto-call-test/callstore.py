@@ -0,0 +1,104 @@
+import sqlite3
+import time
+
+# Call states after which no more status callbacks arrive. "retry_pending" numbers ran out
+# of attempts on throttling or server errors and are dialed again by the next run;
+# "unverified" ones may have become a call and are checked like "dialing" rows on resume.
+FINAL_STATUSES = ("completed", "busy", "no-answer", "canceled", "failed", "exception", "retry_pending", "unverified")
+# Rows without a sid that a resumed campaign still skips: permanent failures, and numbers
+# that may have become a call (reconciled separately, see in_flight()).
+SKIPPED_WITHOUT_SID = ("failed", "dialing", "unverified")
+
+
+class CallStore:
+    # One row per dialed number, written as each result arrives. WAL mode lets
+    # 'python main.py --summary' read the store while a campaign is running.
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS calls (
+                number TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                sid TEXT,
+                error TEXT,
+                duration INTEGER,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS calls_status ON calls (status);
+            CREATE UNIQUE INDEX IF NOT EXISTS calls_sid ON calls (sid) WHERE sid IS NOT NULL;
+            """
+        )
+        self.conn.commit()
+        # Separate connection for lookups from the ingest worker thread.
+        self._reader = None
+
+    def record(self, result):
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO calls (number, status, sid, error, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (number) DO UPDATE SET
+                    status = excluded.status, sid = excluded.sid, error = excluded.error, updated_at = excluded.updated_at
+                """,
+                (result["number"], result.get("status") or "unknown", result.get("sid"), result.get("error"), now, now),
+            )
+
+    def mark_dialing(self, number):
+        # Written before the first request for a number. A row still 'dialing' after a crash
+        # may or may not have become a call; see in_flight().
+        self.record({"number": number, "status": "dialing"})
+
+    def in_flight(self):
+        return self.conn.execute("SELECT number, created_at FROM calls WHERE status IN ('dialing', 'unverified')").fetchall()
+
+    def forget(self, number):
+        with self.conn:
+            self.conn.execute("DELETE FROM calls WHERE number = ?", (number,))
+
+    def update_status(self, sid, status, duration=None, error=None):
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE calls SET status = ?, duration = COALESCE(?, duration), error = COALESCE(?, error), updated_at = ? WHERE sid = ?",
+                (status, duration, error, time.time(), sid),
+            )
+        return cursor.rowcount > 0
+
+    def known(self, numbers):
+        # Numbers of `numbers` that a resumed campaign must not dial again: those that became
+        # a call, and those in SKIPPED_WITHOUT_SID. Transport errors and give-ups are dialed again.
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        statuses = ", ".join("?" for _ in SKIPPED_WITHOUT_SID)
+        found = set()
+        for start in range(0, len(numbers), 500):
+            chunk = numbers[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._reader.execute(
+                f"SELECT number FROM calls WHERE number IN ({placeholders}) AND (sid IS NOT NULL OR status IN ({statuses}))",
+                (*chunk, *SKIPPED_WITHOUT_SID),
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM calls").fetchone()[0]
+
+    def status_counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM calls GROUP BY status ORDER BY status"))
+
+    def pending_count(self):
+        placeholders = ", ".join("?" for _ in FINAL_STATUSES)
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM calls WHERE status NOT IN ({placeholders})", FINAL_STATUSES
+        ).fetchone()[0]
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+        self.conn.close()
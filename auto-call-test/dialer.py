@@ -0,0 +1,177 @@
+import asyncio
+import email.utils
+import random
+import time
+import aiohttp
+from retry import NOT_CREATED_STATUSES, backoff_delay, is_retryable, parse_retry_after
+
+TWILIO_API_BASE = "https://api.twilio.com"
+# Allowed difference between our clock and Twilio's when matching a created call to an attempt.
+CLOCK_SKEW = 30
+
+
+# Places calls through the Twilio REST Calls endpoint over one keep-alive connection pool.
+# `concurrency` bounds both open connections and requests in flight, so throughput is
+# limited by Twilio, not by threads. Results have the same shape as the old make_call.
+# Throttling and server errors are retried with backoff (see retry.py); a 429 pauses every
+# worker until Retry-After has passed instead of each one finding out on its own.
+class AsyncDialer:
+    def __init__(
+        self,
+        account_sid,
+        auth_token,
+        from_number,
+        twiml_url,
+        concurrency=50,
+        api_base=TWILIO_API_BASE,
+        timeout=30,
+        status_callback=None,
+        max_retries=5,
+        retry_base_delay=0.5,
+        retry_max_delay=30,
+        max_throttle_wait=600,
+    ):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.twiml_url = twiml_url
+        self.concurrency = max(1, concurrency)
+        self.calls_url = f"{api_base.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Calls.json"
+        self.timeout = timeout
+        # Twilio posts the final state of each call here (see webhook.py).
+        self.status_callback = status_callback
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_throttle_wait = max_throttle_wait
+        self.retries = 0
+        self.session = None
+        self._resume_at = 0.0
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            auth=aiohttp.BasicAuth(self.account_sid, self.auth_token),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def _post_call(self, phone_number):
+        data = {"To": phone_number, "From": self.from_number, "Url": self.twiml_url}
+        if self.status_callback:
+            data["StatusCallback"] = self.status_callback
+            data["StatusCallbackMethod"] = "POST"
+        async with self.session.post(self.calls_url, data=data) as response:
+            try:
+                payload = await response.json(content_type=None)
+            except ValueError:
+                payload = {}
+            return response.status, payload if isinstance(payload, dict) else {}, parse_retry_after(response.headers.get("Retry-After"))
+
+    async def find_created_call(self, phone_number, since):
+        # Looks for a call to `phone_number` from our number created at or after `since`,
+        # so an attempt whose response was lost is not dialed a second time.
+        params = {"To": phone_number, "From": self.from_number, "PageSize": "20"}
+        async with self.session.get(self.calls_url, params=params) as response:
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
+        for call in payload.get("calls", []):
+            try:
+                created = email.utils.parsedate_to_datetime(call.get("date_created") or "").timestamp()
+            except (TypeError, ValueError):
+                continue
+            if created >= since - CLOCK_SKEW:
+                return {"number": phone_number, "status": call.get("status"), "sid": call.get("sid")}
+        return None
+
+    async def _wait_for_throttle(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            # Spread the workers out so they do not all hit the limit again at once.
+            await asyncio.sleep(delay + random.uniform(0, self.retry_base_delay))
+
+    async def make_call(self, phone_number):
+        # A number that runs out of attempts comes back as "retry_pending" and is dialed
+        # again by the next run. Waiting out a Retry-After does not use up an attempt; being
+        # throttled for more than `max_throttle_wait` seconds since the first 429 does.
+        failures = 0
+        throttled_since = None
+        sent = False
+        unconfirmed_since = None
+        while True:
+            if unconfirmed_since is not None:
+                # The last attempt may have created a call. Checked after the backoff so a call
+                # Twilio was still creating shows up in the list before we send again.
+                try:
+                    existing = await self.find_created_call(phone_number, unconfirmed_since)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    # Without knowing whether the call exists, retrying could dial twice.
+                    return {"number": phone_number, "status": "unverified", "error": f"{error} (could not check for a created call: {e})"}
+                if existing:
+                    return existing
+                unconfirmed_since = None
+            throttle_wait = 0.0 if throttled_since is None else time.monotonic() - throttled_since
+            if failures > self.max_retries or throttle_wait > self.max_throttle_wait:
+                return {"number": phone_number, "status": "retry_pending", "error": f"{error} (gave up after {failures} failed attempts and {throttle_wait:.0f}s throttled)"}
+
+            await self._wait_for_throttle()
+            if sent:
+                self.retries += 1
+            sent = True
+            sent_at = time.time()
+            retry_after = None
+            try:
+                status_code, payload, retry_after = await self._post_call(phone_number)
+            except aiohttp.ClientConnectorError as e:
+                # No connection was made, so no call was created.
+                error, maybe_created, throttled = str(e) or type(e).__name__, False, False
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error, maybe_created, throttled = str(e) or type(e).__name__, True, False
+            else:
+                if status_code < 400:
+                    return {"number": phone_number, "status": payload.get("status"), "sid": payload.get("sid")}
+                # Same text as TwilioRestException.msg from the official client.
+                error = "Unable to create record"
+                if payload.get("message"):
+                    error = f"{error}: {payload['message']}"
+                if not is_retryable(status_code, payload.get("code")):
+                    return {"number": phone_number, "status": "failed", "error": error}
+                maybe_created, throttled = status_code not in NOT_CREATED_STATUSES, status_code == 429
+
+            if maybe_created:
+                unconfirmed_since = sent_at
+            if throttled and throttled_since is None:
+                throttled_since = time.monotonic()
+            if throttled and retry_after is not None:
+                # A Retry-After of 0 or in the past still waits, or the worker would resend at once.
+                self._resume_at = max(self._resume_at, time.monotonic() + max(retry_after, self.retry_base_delay))
+                continue
+            delay = backoff_delay(failures, self.retry_base_delay, self.retry_max_delay)
+            failures += 1
+            if throttled:
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            elif failures <= self.max_retries or maybe_created:
+                await asyncio.sleep(delay)
+
+    async def dial_queue(self, queue, on_result, on_attempt=None):
+        # A fixed set of workers takes numbers from the queue until each gets a None.
+        # `on_attempt` is called before a number is first sent, so a crash mid-call leaves a trace.
+        async def worker():
+            while True:
+                number = await queue.get()
+                if number is None:
+                    return
+                if on_attempt is not None:
+                    on_attempt(number)
+                try:
+                    result = await self.make_call(number)
+                except Exception as e:
+                    # One bad response must not stop the other workers and the campaign.
+                    result = {"number": number, "status": "exception", "error": str(e) or type(e).__name__}
+                on_result(result)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
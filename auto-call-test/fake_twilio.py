@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import base64
+import email.utils
+import random
+import uuid
+import aiohttp
+from aiohttp import web
+from webhook import twilio_signature
+
+# Stand-in for the Twilio Calls endpoint, for trying the dialer locally:
+#   python fake_twilio.py --port 8099
+#   TWILIO_API_BASE=http://127.0.0.1:8099 python main.py
+# The magic test numbers fail the way Twilio's test credentials do. Calls created with a
+# StatusCallback get a signed 'completed' callback after --call-duration seconds.
+# --throttle-rate answers a share of requests with 429 and Retry-After, and --error-rate
+# creates the call but answers 500, which is the case that could lead to double-dialing.
+MAGIC_ERRORS = {
+    "+15005550001": (21217, "Phone number does not appear to be valid"),
+    "+15005550002": (21214, "'To' phone number cannot be reached"),
+    "+15005550003": (21215, "Account not authorized to call this number"),
+    "+15005550004": (21216, "Account not allowed to call this number"),
+}
+
+
+def create_app(latency=0.0, call_duration=1.0, throttle_rate=0.0, error_rate=0.0, retry_after=1):
+    app = web.Application()
+    app["stats"] = {"calls": 0, "throttled": 0, "errors": 0}
+    app["created"] = {}
+    app["callbacks"] = set()
+
+    async def send_status_callback(url, auth_token, params):
+        await asyncio.sleep(call_duration)
+        headers = {"X-Twilio-Signature": twilio_signature(auth_token, url, params)}
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, data=params, headers=headers) as response:
+                    await response.read()
+        except aiohttp.ClientError as e:
+            print(f"Status callback to {url} failed: {e}")
+
+    async def create_call(request):
+        if not request.headers.get("Authorization", "").startswith("Basic "):
+            return web.json_response({"code": 20003, "message": "Authenticate", "status": 401}, status=401)
+        form = await request.post()
+        if latency:
+            await asyncio.sleep(latency)
+        to = form.get("To", "")
+        if random.random() < throttle_rate:
+            app["stats"]["throttled"] += 1
+            return web.json_response(
+                {"code": 20429, "message": "Too Many Requests", "status": 429},
+                status=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+        if to in MAGIC_ERRORS:
+            code, message = MAGIC_ERRORS[to]
+            return web.json_response({"code": code, "message": message, "status": 400}, status=400)
+        app["stats"]["calls"] += 1
+        sid = "CA" + uuid.uuid4().hex
+        if form.get("StatusCallback"):
+            # Twilio signs callbacks with the auth token, which is the Basic auth password here.
+            credentials = base64.b64decode(request.headers["Authorization"][6:]).decode("utf-8")
+            auth_token = credentials.partition(":")[2]
+            params = {
+                "AccountSid": request.match_info["account_sid"],
+                "CallSid": sid,
+                "CallStatus": "completed",
+                "CallDuration": str(max(1, round(call_duration))),
+                "To": to,
+                "From": form.get("From", ""),
+            }
+            task = asyncio.create_task(send_status_callback(form["StatusCallback"], auth_token, params))
+            app["callbacks"].add(task)
+            task.add_done_callback(app["callbacks"].discard)
+        call = {
+            "sid": sid,
+            "account_sid": request.match_info["account_sid"],
+            "to": to,
+            "from": form.get("From", ""),
+            "status": "queued",
+            "date_created": email.utils.formatdate(usegmt=True),
+        }
+        app["created"].setdefault(to, []).insert(0, call)
+        if random.random() < error_rate:
+            app["stats"]["errors"] += 1
+            return web.json_response({"code": 20500, "message": "Internal Server Error", "status": 500}, status=500)
+        return web.json_response(call, status=201)
+
+    async def list_calls(request):
+        if not request.headers.get("Authorization", "").startswith("Basic "):
+            return web.json_response({"code": 20003, "message": "Authenticate", "status": 401}, status=401)
+        calls = app["created"].get(request.query.get("To", ""), [])
+        if "From" in request.query:
+            calls = [call for call in calls if call["from"] == request.query["From"]]
+        page_size = int(request.query.get("PageSize", 50))
+        return web.json_response({"calls": calls[:page_size], "page_size": page_size})
+
+    app.router.add_post("/2010-04-01/Accounts/{account_sid}/Calls.json", create_call)
+    app.router.add_get("/2010-04-01/Accounts/{account_sid}/Calls.json", list_calls)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Twilio Calls API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response.")
+    parser.add_argument("--call-duration", type=float, default=1.0, help="Seconds before the status callback.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of created calls answered with 500.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429.")
+    args = parser.parse_args()
+    app = create_app(args.latency, args.call_duration, args.throttle_rate, args.error_rate, args.retry_after)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
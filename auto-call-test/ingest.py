@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import itertools
+import math
+import re
+import sys
+
+_SEPARATORS = re.compile(r"[\s().\-/]")
+_E164 = re.compile(r"^\+[1-9]\d{7,14}$")
+
+
+def read_entries(source):
+    # One number per line or comma separated, read lazily from a file or stdin ("-").
+    f = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in f:
+            for entry in line.split(","):
+                entry = entry.strip()
+                if entry:
+                    yield entry
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def normalize_e164(raw, default_country_code="1"):
+    number = _SEPARATORS.sub("", raw)
+    if number.startswith("00"):
+        number = "+" + number[2:]
+    elif not number.startswith("+"):
+        # National format: drop the trunk prefix and add the default country code,
+        # unless the number already starts with it (e.g. 14108675310).
+        if not (number.startswith(default_country_code) and len(number) > 10):
+            number = default_country_code + number.lstrip("0")
+        number = "+" + number
+    return number if _E164.match(number) else None
+
+
+class _BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, first, second):
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, hashed):
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(*hashed))
+
+    def add(self, hashed):
+        for position in self._positions(*hashed):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class NumberDeduper:
+    # Scalable Bloom filter over normalized numbers: it starts with room for
+    # `initial_capacity` numbers and adds a filter four times larger whenever the last
+    # one is full, so a short list costs little memory and a long one keeps `error_rate`.
+    # A false positive skips a number instead of dialing it twice.
+    def __init__(self, initial_capacity, error_rate):
+        self.error_rate = error_rate
+        self.count = 0
+        # Each new filter gets half the error rate of the one before, so the sum stays below error_rate.
+        self._filters = [_BloomFilter(max(1, initial_capacity), error_rate / 2)]
+
+    def add(self, number):
+        # Returns False when the number was (probably) seen before.
+        digest = hashlib.blake2b(number.encode("ascii"), digest_size=16).digest()
+        hashed = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        if any(hashed in bloom for bloom in self._filters):
+            return False
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            current = _BloomFilter(current.capacity * 4, self.error_rate / 2 ** (len(self._filters) + 1))
+            self._filters.append(current)
+        current.add(hashed)
+        self.count += 1
+        return True
+
+
+class IngestStats:
+    def __init__(self):
+        self.read = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.already_dialed = 0
+        self.queued = 0
+
+
+def _next_batch(entries, batch_size, default_country_code, deduper, stats, known=None):
+    batch = []
+    read = 0
+    for entry in itertools.islice(entries, batch_size):
+        read += 1
+        number = normalize_e164(entry, default_country_code)
+        if number is None:
+            stats.invalid += 1
+        elif not deduper.add(number):
+            stats.duplicates += 1
+        else:
+            batch.append(number)
+    if known is not None and batch:
+        # Numbers already in the call store were dialed by an earlier run of the campaign.
+        dialed = known(batch)
+        if dialed:
+            stats.already_dialed += len(dialed)
+            batch = [number for number in batch if number not in dialed]
+    stats.read += read
+    return batch, read
+
+
+async def feed_numbers(entries, queue, consumers, batch_size, default_country_code, deduper, stats, known=None):
+    # Reading and normalizing run in a worker thread one batch at a time; queue.put
+    # waits while the dialer is behind, so at most one batch plus the queue is in memory.
+    entries = iter(entries)
+    try:
+        while True:
+            batch, read = await asyncio.to_thread(_next_batch, entries, batch_size, default_country_code, deduper, stats, known)
+            if not read:
+                break
+            for number in batch:
+                await queue.put(number)
+                stats.queued += 1
+    finally:
+        for _ in range(consumers):
+            await queue.put(None)
@@ -1,13 +1,49 @@
-import concurrent.futures
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
+import argparse
+import asyncio
+import itertools
+import os
+import time
+import aiohttp
 from decouple import config
+from callstore import CallStore
+from dialer import TWILIO_API_BASE, AsyncDialer
+from ingest import IngestStats, NumberDeduper, feed_numbers, read_entries
+from webhook import CALLBACK_PATH, start_receiver
 
 TEST_ACCOUNT_SID = config("TWILIO_ACCOUNT_SID", default="")
 TEST_AUTH_TOKEN = config("TWILIO_AUTH_TOKEN", default="")  
 
 TWILIO_TEST_FROM_NUMBER = "+15005550006"
 
+# Point at a local stand-in (see fake_twilio.py) to try the dialer without Twilio.
+API_BASE = config("TWILIO_API_BASE", default=TWILIO_API_BASE)
+# Calls in flight at once; Twilio's own rate limits are the real ceiling.
+DIAL_CONCURRENCY = config("DIAL_CONCURRENCY", default=50, cast=int)
+# Throttled (429) and failed (5xx, timeout) requests are retried this many times with jittered
+# exponential backoff between RETRY_BASE_DELAY and RETRY_MAX_DELAY seconds, unless Twilio sends Retry-After
+MAX_RETRIES = config("MAX_RETRIES", default=5, cast=int)
+RETRY_BASE_DELAY = config("RETRY_BASE_DELAY", default=0.5, cast=float)
+RETRY_MAX_DELAY = config("RETRY_MAX_DELAY", default=30, cast=float)
+# Retry-After waits do not count as attempts; a number throttled for longer than this is left for the next run
+MAX_THROTTLE_WAIT = config("MAX_THROTTLE_WAIT", default=600, cast=float)
+# Country code added to numbers written without one
+DEFAULT_COUNTRY_CODE = config("DEFAULT_COUNTRY_CODE", default="1")
+# Numbers are read and normalized this many at a time, and at most QUEUE_SIZE wait for a free dialer
+INGEST_BATCH_SIZE = config("INGEST_BATCH_SIZE", default=1000, cast=int)
+QUEUE_SIZE = config("QUEUE_SIZE", default=5000, cast=int)
+# Duplicate detection stays exact-ish up to this many unique numbers
+DEDUP_INITIAL_CAPACITY = config("DEDUP_INITIAL_CAPACITY", default=100_000, cast=int)
+DEDUP_ERROR_RATE = config("DEDUP_ERROR_RATE", default=1e-7, cast=float)
+# Every result is written here as it arrives; running again with the same store resumes the campaign
+CALL_STORE = config("CALL_STORE", default="calls.db")
+# Public URL that forwards to the local status callback receiver, e.g. an ngrok tunnel
+# ending in /status-callback. Leave empty to keep the status returned when the call was created.
+STATUS_CALLBACK_URL = config("STATUS_CALLBACK_URL", default="")
+WEBHOOK_HOST = config("WEBHOOK_HOST", default="127.0.0.1")
+WEBHOOK_PORT = config("WEBHOOK_PORT", default=8098, cast=int)
+# Seconds to wait for the final status of calls still in progress after the last one is placed
+CALLBACK_WAIT = config("CALLBACK_WAIT", default=120, cast=int)
+
 AI_VOICE_MESSAGE_URL = "http://twimlets.com/message?Message%5B0%5D=Hello%2C%20this%20is%20a%20test%20call%20from%20our%20automated%20system.%20Thank%20you%20for%20your%20time.%20Goodbye.&Voice=alice&"
 
 def get_phone_numbers():
@@ -22,12 +58,10 @@ def get_phone_numbers():
         return [num.strip() for num in numbers_str.split(',')]
     elif choice == '2':
         file_path = input("Enter the file path: ")
-        try:
-            with open(file_path, 'r') as f:
-                return [line.strip() for line in f if line.strip()]
-        except FileNotFoundError:
+        if not os.path.isfile(file_path):
             print("Error: File not found.")
             return []
+        return read_entries(file_path)
     elif choice == '3':
         print("Using a default list of Twilio's magic test numbers.")
         return [
@@ -41,58 +75,171 @@ def get_phone_numbers():
         print("Invalid choice.")
         return []
 
-def make_call(phone_number, client):
+async def dial(entries, store, on_result):
+    stats = IngestStats()
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    deduper = NumberDeduper(DEDUP_INITIAL_CAPACITY, DEDUP_ERROR_RATE)
+    receiver = None
+    retries = 0
+    if STATUS_CALLBACK_URL:
+        receiver = await start_receiver(store, TEST_AUTH_TOKEN, STATUS_CALLBACK_URL, WEBHOOK_HOST, WEBHOOK_PORT)
     try:
-        call = client.calls.create(
-            to=phone_number,
-            from_=TWILIO_TEST_FROM_NUMBER,
-            url=AI_VOICE_MESSAGE_URL
-        )
-        return {"number": phone_number, "status": call.status, "sid": call.sid}
-    except TwilioRestException as e:
-        return {"number": phone_number, "status": "failed", "error": e.msg}
+        async with AsyncDialer(
+            TEST_ACCOUNT_SID,
+            TEST_AUTH_TOKEN,
+            TWILIO_TEST_FROM_NUMBER,
+            AI_VOICE_MESSAGE_URL,
+            concurrency=DIAL_CONCURRENCY,
+            api_base=API_BASE,
+            status_callback=STATUS_CALLBACK_URL or None,
+            max_retries=MAX_RETRIES,
+            retry_base_delay=RETRY_BASE_DELAY,
+            retry_max_delay=RETRY_MAX_DELAY,
+            max_throttle_wait=MAX_THROTTLE_WAIT,
+        ) as dialer:
+            await reconcile_in_flight(store, dialer, on_result)
+            await asyncio.gather(
+                feed_numbers(entries, queue, dialer.concurrency, INGEST_BATCH_SIZE, DEFAULT_COUNTRY_CODE, deduper, stats, store.known),
+                dialer.dial_queue(queue, on_result, store.mark_dialing),
+            )
+            retries = dialer.retries
+        if receiver is not None:
+            await wait_for_final_states(store)
+    finally:
+        if receiver is not None:
+            await receiver.cleanup()
+    return stats, retries
+
+async def reconcile_in_flight(store, dialer, on_result):
+    # Numbers an interrupted run was dialing: keep the call if Twilio created it, otherwise
+    # drop the row so the number is dialed again.
+    rows = store.in_flight()
+    if not rows:
+        return
+    print(f"Checking {len(rows)} calls that were in progress when the last run stopped...")
+    for number, started_at in rows:
+        try:
+            existing = await dialer.find_created_call(number, started_at)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"Error: Could not check {number}; it is skipped until a later run can: {e}")
+            continue
+        if existing:
+            on_result(existing)
+        else:
+            store.forget(number)
+
+async def wait_for_final_states(store):
+    deadline = time.monotonic() + CALLBACK_WAIT
+    pending = store.pending_count()
+    if pending:
+        print(f"\nWaiting up to {CALLBACK_WAIT}s for the final status of {pending} calls...")
+    while pending and time.monotonic() < deadline:
+        await asyncio.sleep(1)
+        pending = store.pending_count()
+    if pending:
+        print(f"{pending} calls are still in progress. Run 'python main.py --listen' to keep receiving their status.")
+
+async def listen(store):
+    receiver = await start_receiver(store, TEST_AUTH_TOKEN, STATUS_CALLBACK_URL, WEBHOOK_HOST, WEBHOOK_PORT)
+    print(f"Receiving status callbacks on http://{WEBHOOK_HOST}:{WEBHOOK_PORT}{CALLBACK_PATH}. Press Ctrl+C to stop.")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await receiver.cleanup()
+
+def print_call(log):
+    status = log.get('status', 'unknown')
+    if log.get('error'):
+        print(f"Number: {log['number']:<15} | Status: {status:<8} | Info: {log.get('error', 'N/A')}")
+    else:
+        print(f"Number: {log['number']:<15} | Status: {status:<8} | Info: SID {log.get('sid', 'N/A')}")
+
+def print_summary(store):
+    counts = store.status_counts()
+    print(f"Calls in '{store.path}': {sum(counts.values())}")
+    for status, count in counts.items():
+        print(f"Total calls with status '{status}': {count}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Dial a list of phone numbers through Twilio.")
+    parser.add_argument("source", nargs="?", help="File with the numbers, or '-' for stdin. Asks when omitted.")
+    parser.add_argument("--store", default=CALL_STORE, help=f"Call store of the campaign (default {CALL_STORE}).")
+    parser.add_argument("--summary", action="store_true", help="Print the status counts of the store and exit; works while a campaign runs.")
+    parser.add_argument("--listen", action="store_true", help="Only receive status callbacks for calls already placed.")
+    args = parser.parse_args()
+
+    if args.summary:
+        if not os.path.isfile(args.store):
+            print(f"Error: No call store at '{args.store}'.")
+            return
+        store = CallStore(args.store)
+        try:
+            print_summary(store)
+            print(f"Calls still in progress: {store.pending_count()}")
+        finally:
+            store.close()
+        return
+
     if not TEST_ACCOUNT_SID or not TEST_AUTH_TOKEN:
         print("\nError: Twilio test credentials are not set.")
         print("Please create a .env file and add your TWILIO_TEST_ACCOUNT_SID and TWILIO_TEST_AUTH_TOKEN.")
         return
 
-    client = Client(TEST_ACCOUNT_SID, TEST_AUTH_TOKEN)
-    phone_numbers = get_phone_numbers()
+    if args.listen:
+        if not STATUS_CALLBACK_URL:
+            print("Error: Set STATUS_CALLBACK_URL to the public URL of the receiver.")
+            return
+        store = CallStore(args.store)
+        try:
+            asyncio.run(listen(store))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            store.close()
+        return
+
+    # 'python main.py numbers.txt' or 'cat numbers.txt | python main.py -' skips the menu.
+    if args.source:
+        if args.source != "-" and not os.path.isfile(args.source):
+            print("Error: File not found.")
+            return
+        phone_numbers = read_entries(args.source)
+    else:
+        phone_numbers = get_phone_numbers()
 
-    if not phone_numbers:
+    # read_entries() is lazy, so look at the first entry before opening the store.
+    phone_numbers = iter(phone_numbers)
+    try:
+        first = next(phone_numbers, None)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error: Could not read the numbers: {e}")
+        return
+    if first is None:
         print("No phone numbers to dial.")
         return
+    phone_numbers = itertools.chain([first], phone_numbers)
 
-    call_logs = []
-    print("\nInitiating calls...")
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_number = {executor.submit(make_call, num, client): num for num in phone_numbers}
-        for future in concurrent.futures.as_completed(future_to_number):
-            try:
-                result = future.result()
-                call_logs.append(result)
-            except Exception as exc:
-                call_logs.append({"number": future_to_number[future], "status": "exception", "error": str(exc)})
+    store = CallStore(args.store)
+    if store.count():
+        print(f"Resuming the campaign in '{args.store}': numbers already dialed are skipped.")
 
+    def on_result(log):
+        store.record(log)
+        print_call(log)
+
+    print("\nInitiating calls...")
     print("\n--- Call Logs ---")
-    status_counts = {}
-    
-    call_logs.sort(key=lambda x: x['number'])
-
-    for log in call_logs:
-        status = log.get('status', 'unknown')
-        status_counts[status] = status_counts.get(status, 0) + 1
-        
-        if status == 'failed' or status == 'exception':
-            print(f"Number: {log['number']:<15} | Status: {status:<8} | Info: {log.get('error', 'N/A')}")
-        else:
-            print(f"Number: {log['number']:<15} | Status: {status:<8} | Info: SID {log.get('sid', 'N/A')}")
+    try:
+        stats, retries = asyncio.run(dial(phone_numbers, store, on_result))
 
-    print("\n--- Summary ---")
-    for status, count in status_counts.items():
-        print(f"Total calls with status '{status}': {count}")
+        print("\n--- Summary ---")
+        print(
+            f"Numbers read: {stats.read}, invalid: {stats.invalid}, duplicates skipped: {stats.duplicates}, "
+            f"already dialed: {stats.already_dialed}, dialed: {stats.queued}, retries: {retries}"
+        )
+        print_summary(store)
+    finally:
+        store.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,57 @@
+import email.utils
+import random
+import time
+
+# Twilio error codes (https://www.twilio.com/docs/api/errors) that fail the same way on
+# every attempt. The magic test numbers answer with 21214-21217.
+PERMANENT_CODES = {
+    13223,  # Phone number has an invalid format
+    13224,  # Invalid phone number
+    20003,  # Authentication failed
+    20404,  # Resource not found
+    21205,  # 'Url' is not a valid URL
+    21210,  # 'From' number is not verified for the account
+    21211,  # Invalid 'To' phone number
+    21212,  # Invalid 'From' phone number
+    21214,  # 'To' phone number cannot be reached
+    21215,  # Account not authorized to call this number
+    21216,  # Account not allowed to call this number
+    21217,  # Phone number does not appear to be valid
+    21610,  # Recipient has opted out (STOP)
+}
+RETRYABLE_CODES = {
+    20429,  # Too many requests
+    20500,  # Internal server error
+    20503,  # Service unavailable
+}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Twilio turns these away before creating anything, so retrying them can never dial twice.
+# Any other server error may have arrived after the call was created.
+NOT_CREATED_STATUSES = {429, 503}
+
+
+def is_retryable(status_code, code):
+    if code in PERMANENT_CODES:
+        return False
+    return code in RETRYABLE_CODES or status_code in RETRYABLE_STATUSES
+
+
+def backoff_delay(attempt, base, cap):
+    # Full jitter: workers that failed together do not come back together.
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date.
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
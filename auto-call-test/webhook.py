@@ -0,0 +1,47 @@
+import base64
+import hashlib
+import hmac
+from aiohttp import web
+
+CALLBACK_PATH = "/status-callback"
+
+
+def twilio_signature(auth_token, url, params):
+    # X-Twilio-Signature: HMAC-SHA1 over the callback URL followed by the sorted POST parameters.
+    payload = url + "".join(f"{key}{params[key]}" for key in sorted(params))
+    digest = hmac.new(auth_token.encode("utf-8"), payload.encode("utf-8"), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+# Receives Twilio status callbacks and writes the final state of each call to the store.
+# `public_url` is the StatusCallback URL Twilio was given, which is what it signs.
+def create_app(store, auth_token, public_url):
+    app = web.Application()
+
+    async def status_callback(request):
+        form = await request.post()
+        params = {key: form[key] for key in form}
+        expected = twilio_signature(auth_token, public_url, params)
+        if not hmac.compare_digest(request.headers.get("X-Twilio-Signature", ""), expected):
+            return web.Response(status=403, text="Invalid signature")
+
+        sid = params.get("CallSid")
+        status = params.get("CallStatus")
+        if not sid or not status:
+            return web.Response(status=400, text="CallSid and CallStatus are required")
+        duration = params.get("CallDuration")
+        error = params.get("ErrorMessage") or params.get("ErrorCode")
+        if not store.update_status(sid, status, int(duration) if duration and duration.isdigit() else None, error):
+            print(f"Warning: status callback for unknown call {sid} ({status}).")
+        # Twilio expects an empty TwiML document or no content.
+        return web.Response(status=204)
+
+    app.router.add_post(CALLBACK_PATH, status_callback)
+    return app
+
+
+async def start_receiver(store, auth_token, public_url, host, port):
+    runner = web.AppRunner(create_app(store, auth_token, public_url), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -1,12 +1,12 @@
 import json
 import getpass
 from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import config
+from browser import build_firefox_options
 
 class LinkedInAuth:
     def __init__(self, username, password):
@@ -14,15 +14,14 @@ class LinkedInAuth:
         self.password = password
         self.driver = None
 
-    def login(self):
-        options = Options()
-        if config.HEADLESS:
-            options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        
-        self.driver = webdriver.Firefox(options=options)
-        print("[INFO] Starting browser...")
+    def login(self, driver=None):
+        # With an existing driver (the session daemon), log in there and keep the browser open.
+        owns_driver = driver is None
+        if owns_driver:
+            self.driver = webdriver.Firefox(options=build_firefox_options())
+            print("[INFO] Starting browser...")
+        else:
+            self.driver = driver
 
         try:
             self.driver.get(config.LOGIN_URL)
@@ -53,6 +52,7 @@ class LinkedInAuth:
             
             print("\n[SUCCESS] Login successful!")
             self._save_cookies()
+            return True
 
         except TimeoutException:
             print(f"\n[ERROR] Login Failed: A timeout occurred. This could be due to:")
@@ -64,9 +64,10 @@ class LinkedInAuth:
             print(f"An unexpected error occurred: {e}")
 
         finally:
-            if self.driver:
+            if owns_driver and self.driver:
                 print("[INFO] Closing browser.")
                 self.driver.quit()
+        return False
 
     def _save_cookies(self):
         cookies = self.driver.get_cookies()
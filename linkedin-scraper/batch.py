@@ -0,0 +1,58 @@
+import os
+import re
+import config
+
+
+def _job_name(job):
+    return re.sub(r"[^a-z0-9]+", "-", f"{job['keywords']} {job['location']}".lower()).strip("-")
+
+
+def load_jobs(path):
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        spec = yaml.safe_load(f) or {}
+    if isinstance(spec, list):
+        spec = {"jobs": spec}
+
+    output_dir = spec.get("output_dir", "batch_output")
+    jobs = []
+    names = set()
+    for number, entry in enumerate(spec.get("jobs") or [], 1):
+        if not isinstance(entry, dict) or not entry.get("keywords"):
+            raise ValueError(f"Job {number} in '{path}' needs at least 'keywords'.")
+        job = {
+            "keywords": str(entry["keywords"]),
+            "location": str(entry.get("location", config.LOCATION)),
+            "profiles": int(entry.get("profiles", config.PROFILES_TO_SCRAPE)),
+        }
+        job["name"] = str(entry.get("name") or _job_name(job))
+        if job["name"] in names:
+            raise ValueError(f"Duplicate job name '{job['name']}' in '{path}'.")
+        names.add(job["name"])
+        job["output"] = entry.get("output") or os.path.join(output_dir, f"{job['name']}.{config.OUTPUT_FORMAT}")
+        jobs.append(job)
+
+    aggregate = spec.get("aggregate") or os.path.join(output_dir, f"all_profiles.{config.OUTPUT_FORMAT}")
+    return jobs, aggregate
+
+
+def run_batch(path, resume=False, quiet=False):
+    from scraper import LinkedInScraper
+
+    try:
+        jobs, aggregate = load_jobs(path)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read jobs file: {e}")
+        return
+    if not jobs:
+        print(f"[ERROR] No jobs found in '{path}'.")
+        return
+
+    for output in [job["output"] for job in jobs] + [aggregate]:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    print(f"[INFO] Running {len(jobs)} search jobs from '{path}'.")
+    LinkedInScraper().scrape_jobs(jobs, aggregate, resume=resume, quiet=quiet)
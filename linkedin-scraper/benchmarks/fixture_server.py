@@ -0,0 +1,180 @@
+import argparse
+import html
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Serves synthetic LinkedIn-like pages that use the same class names as the extractors.
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<link rel="canonical" href="{canonical}"></head>
+<body><main>{body}</main>{script}</body></html>"""
+
+# Appends the remaining list items in chunks when the page is scrolled to the bottom,
+# like LinkedIn's lazy-loaded lists.
+_LAZY_SCRIPT = """<script>
+const pending = {pending};
+const list = document.getElementById("lazy-list");
+let loading = false;
+window.addEventListener("scroll", () => {{
+    if (loading || !pending.length) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 5) return;
+    loading = true;
+    setTimeout(() => {{
+        for (const item of pending.splice(0, {chunk})) list.insertAdjacentHTML("beforeend", item);
+        loading = false;
+    }}, {delay});
+}});
+</script>"""
+
+
+class FixtureSettings:
+    def __init__(self, latency=0.0, results_per_page=10, pages=10, list_length=8, lazy_chunk=4, lazy_delay_ms=100):
+        self.latency = latency
+        self.results_per_page = results_per_page
+        self.pages = pages
+        self.list_length = list_length
+        self.lazy_chunk = lazy_chunk
+        self.lazy_delay_ms = lazy_delay_ms
+
+
+def _hidden(text):
+    return f'<span aria-hidden="true">{html.escape(text)}</span>'
+
+
+def _paired_item(css_class, title, subtitle):
+    return (
+        f'<li class="{css_class}">'
+        f'<div class="hoverable-link-text">{_hidden(title)}</div>'
+        f'<span class="t-14 t-normal">{_hidden(subtitle)}</span>'
+        "</li>"
+    )
+
+
+def _skill_item(css_class, skill):
+    return f'<li class="{css_class}"><div class="hoverable-link-text">{_hidden(skill)}</div></li>'
+
+
+def _top_card(slug):
+    return (
+        '<section class="artdeco-card">'
+        f'<h1 class="text-heading-xlarge">Person {html.escape(slug)}</h1>'
+        f'<div class="text-body-medium break-words">Full Stack Engineer at Company {html.escape(slug)}</div>'
+        '<span class="text-body-small inline">Paris, France</span>'
+        "</section>"
+    )
+
+
+def _items(kind, slug, count, css_class):
+    if kind == "experience":
+        return [_paired_item(css_class, f"Engineer {i}", f"Company {slug}-{i}") for i in range(count)]
+    if kind == "education":
+        return [_paired_item(css_class, f"University {i}", f"Degree {i}") for i in range(count)]
+    return [_skill_item(css_class, f"Skill {i}") for i in range(count)]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    settings = FixtureSettings()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _page(self, title, body, script=""):
+        canonical = f"http://{self.headers.get('Host', 'localhost')}{self.path}"
+        self._send(200, _PAGE.format(title=title, canonical=html.escape(canonical), body=body, script=script))
+
+    def do_GET(self):
+        settings = self.settings
+        if settings.latency:
+            time.sleep(settings.latency)
+
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+
+        if url.path == "/voyager/api/me":
+            self._send(200, json.dumps({"plainId": 1}), "application/json")
+        elif url.path.startswith("/search/results/people"):
+            self._search(int(parse_qs(url.query).get("page", ["1"])[0]))
+        elif len(parts) == 2 and parts[0] == "in":
+            self._profile(parts[1])
+        elif len(parts) == 4 and parts[0] == "in" and parts[2] == "details":
+            self._details(parts[1], parts[3])
+        elif url.path == "/":
+            self._page("Feed", '<div id="global-nav-search"></div>')
+        else:
+            self._send(404, "Not found")
+
+    def _search(self, page):
+        settings = self.settings
+        if page > settings.pages:
+            self._page("Search", '<div class="search-results-container"></div>')
+            return
+        links = "".join(
+            f'<li><a data-test-app-aware-link href="/in/person-{page}-{i}/?miniProfileUrn=x">Person {page}-{i}</a></li>'
+            for i in range(settings.results_per_page)
+        )
+        self._page("Search", f'<div class="search-results-container"><ul>{links}</ul></div>')
+
+    def _profile(self, slug):
+        length = self.settings.list_length
+        sections = "".join(
+            f'<section><h2>{title}</h2><ul>{"".join(_items(kind, slug, length, "artdeco-list__item"))}</ul></section>'
+            for title, kind in (("Experience", "experience"), ("Education", "education"), ("Skills", "skills"))
+        )
+        self._page(f"Person {slug}", _top_card(slug) + sections)
+
+    def _details(self, slug, kind):
+        if kind not in ("experience", "education", "skills"):
+            self._send(404, "Not found")
+            return
+        settings = self.settings
+        items = _items(kind, slug, settings.list_length, "pvs-list__paged-list-item")
+        first, pending = items[:settings.lazy_chunk], items[settings.lazy_chunk:]
+        # Tall enough that the page has to be scrolled to load the rest.
+        body = f'<section><h2>{kind.title()}</h2><ul id="lazy-list">{"".join(first)}</ul></section><div style="height:2000px"></div>'
+        script = _LAZY_SCRIPT.format(pending=json.dumps(pending), chunk=settings.lazy_chunk, delay=settings.lazy_delay_ms)
+        self._page(f"{kind} of {slug}", body, script)
+
+
+def start_server(settings, host="127.0.0.1", port=0):
+    handler = type("ConfiguredFixtureHandler", (FixtureHandler,), {"settings": settings})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic LinkedIn-like pages for benchmarks.")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering each request.")
+    parser.add_argument("--results-per-page", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--list-length", type=int, default=8)
+    args = parser.parse_args()
+
+    settings = FixtureSettings(args.latency, args.results_per_page, args.pages, args.list_length)
+    server = start_server(settings, port=args.port)
+    print(f"[INFO] Fixture server running on http://127.0.0.1:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
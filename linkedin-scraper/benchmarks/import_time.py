@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded by the CLI itself or by the cheap actions.
+HEAVY_MODULES = ["selenium", "lxml", "pandas", "pyarrow", "yaml", "urllib3", "twilio"]
+
+# Runs in a fresh interpreter, from an empty directory, so nothing is cached
+# in sys.modules and 'status' finds no files to read.
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {project!r})
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+action = {action!r}
+if action:
+    main.main(action)
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "heavy": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+
+def probe(action, workdir):
+    code = _PROBE.format(project=PROJECT_DIR, action=action, heavy=HEAVY_MODULES)
+    completed = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the CLI and its cheap actions start fast.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per case; the best run counts.")
+    parser.add_argument("--max-ms", type=float, default=150.0, help="Budget for 'import main' plus the action.")
+    args = parser.parse_args()
+
+    cases = [("import main", None), ("main.py status", ["status"]), ("main.py export (usage)", ["export"])]
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, action in cases:
+            runs = [probe(action, workdir) for _ in range(args.runs)]
+            best = min(runs, key=lambda run: run["total_ms"])
+            heavy = sorted({name for run in runs for name in run["heavy"]})
+            print(f"{label:<24} import {best['import_ms']:7.1f} ms   total {best['total_ms']:7.1f} ms   heavy modules: {', '.join(heavy) or 'none'}")
+            if heavy:
+                failures.append(f"{label} imports {', '.join(heavy)}")
+            if best["total_ms"] > args.max_ms:
+                failures.append(f"{label} took {best['total_ms']:.0f} ms (budget {args.max_ms:.0f} ms)")
+
+    if failures:
+        for failure in failures:
+            print(f"[ERROR] {failure}")
+        sys.exit(1)
+    print("[SUCCESS] Startup is within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from fixture_server import FixtureSettings, start_server
+from procmem import browser_rss
+from scraper import LinkedInScraper
+
+
+class BenchmarkScraper(LinkedInScraper):
+    def __init__(self, latencies, workers, snapshots=None):
+        super().__init__(snapshots=snapshots)
+        self.latencies = latencies
+        self.workers = workers
+        workers.append(self)
+
+    def _new_worker(self):
+        return BenchmarkScraper(self.latencies, self.workers, snapshots=self.snapshots)
+
+    def _scrape_profile(self, url):
+        started = time.perf_counter()
+        result = super()._scrape_profile(url)
+        self.latencies.append(time.perf_counter() - started)
+        return result
+
+    def _print_profile(self, i, total, profile_data):
+        pass
+
+
+class MemorySampler:
+    def __init__(self, scrapers, interval=0.5):
+        self.scrapers = scrapers
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            total = 0
+            for scraper in list(self.scrapers):
+                if scraper.driver is not None:
+                    total += browser_rss(scraper.driver)
+            if total:
+                self.samples.append(total)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def _configure(base_url, workdir, mode, args):
+    config.BASE_URL = base_url
+    config.SCRAPE_MODE = mode
+    config.PROFILES_TO_SCRAPE = args.profiles
+    config.WORKERS = args.workers
+    config.EXTRACTION_MODE = args.extraction
+    config.HEADLESS = True
+    config.USE_WARM_SESSION = False
+    config.SNAPSHOT_MODE = None
+    config.PROFILE_DELAY = 0
+    # Every mode scrapes the same fixture profiles.
+    config.SKIP_SEEN_PROFILES = False
+    config.CHANGE_DETECTION = False
+    # Measure the scraper itself, not LinkedIn pacing.
+    config.THROTTLE_START_RATE = config.THROTTLE_MAX_RATE = 1000
+    config.THROTTLE_BURST = 1000
+    config.OUTPUT_FORMAT = "jsonl"
+    config.OUTPUT_FILENAME = os.path.join(workdir, f"{mode.lower()}.jsonl")
+    config.JOURNAL_FILENAME = os.path.join(workdir, f"{mode.lower()}_journal.db")
+    config.METRICS_JSON_FILENAME = os.path.join(workdir, f"{mode.lower()}_metrics.json")
+    config.METRICS_PROMETHEUS_FILENAME = os.path.join(workdir, f"{mode.lower()}_metrics.prom")
+    # Fixture-server hit counts must not end up in the real selector stats.
+    config.SELECTOR_STATS_FILENAME = os.path.join(workdir, f"{mode.lower()}_selector_stats.json")
+    config.COOKIES_FILENAME = os.path.join(workdir, "cookies.json")
+    with open(config.COOKIES_FILENAME, "w") as f:
+        json.dump([{"name": "li_at", "value": "benchmark", "path": "/"}], f)
+
+
+def run_mode(base_url, workdir, mode, args):
+    _configure(base_url, workdir, mode, args)
+    latencies = []
+    scraper = BenchmarkScraper(latencies, [])
+
+    with MemorySampler(scraper.workers) as sampler:
+        started = time.perf_counter()
+        scraper.scrape_profiles()
+        wall_time = time.perf_counter() - started
+
+    scraped = len(latencies)
+    return {
+        "mode": mode,
+        "profiles": scraped,
+        "wall_time_s": round(wall_time, 3),
+        "profiles_per_minute": round(scraped / wall_time * 60, 2) if wall_time else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p90_s": round(percentile(latencies, 90), 3),
+        "latency_p99_s": round(percentile(latencies, 99), 3),
+        "browser_rss_peak_mb": round(max(sampler.samples, default=0) / 2**20, 1),
+        "browser_rss_mean_mb": round(sum(sampler.samples) / len(sampler.samples) / 2**20, 1) if sampler.samples else 0.0,
+    }
+
+
+def print_report(results):
+    print("\n--- Benchmark results ---")
+    header = f"{'Mode':<10} {'Profiles':>8} {'Wall (s)':>9} {'Prof/min':>9} {'p50 (s)':>8} {'p90 (s)':>8} {'p99 (s)':>8} {'RSS peak':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['mode']:<10} {r['profiles']:>8} {r['wall_time_s']:>9.2f} {r['profiles_per_minute']:>9.1f} "
+            f"{r['latency_p50_s']:>8.2f} {r['latency_p90_s']:>8.2f} {r['latency_p99_s']:>8.2f} {r['browser_rss_peak_mb']:>7.0f}MB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scraper throughput against a local fixture server.")
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--modes", nargs="+", default=["SUMMARY", "DETAILED"], choices=["SUMMARY", "DETAILED"])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--extraction", default=config.EXTRACTION_MODE, choices=["DRIVER", "SCRIPT", "HTML"])
+    parser.add_argument("--latency", type=float, default=0.05, help="Server-side delay per request in seconds.")
+    parser.add_argument("--list-length", type=int, default=8, help="Items in each experience/education/skills list.")
+    parser.add_argument("--results-per-page", type=int, default=10)
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    pages = -(-args.profiles // args.results_per_page)
+    settings = FixtureSettings(args.latency, args.results_per_page, pages, args.list_length)
+    server = start_server(settings)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    print(f"[INFO] Fixture server running at {base_url}")
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for mode in args.modes:
+                print(f"\n[INFO] Benchmarking {mode} mode with {args.workers} worker(s)...")
+                results.append(run_mode(base_url, workdir, mode, args))
+    finally:
+        server.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"\n[SUCCESS] Results written to '{args.json}'")
+
+
+if __name__ == "__main__":
+    main()
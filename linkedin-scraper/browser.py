@@ -0,0 +1,52 @@
+import json
+from urllib.parse import quote
+from selenium.webdriver.firefox.options import Options
+import config
+
+LEAN_PREFS = {
+    # 2 = block. Images and (optionally) stylesheets are never used by the extractors.
+    "permissions.default.image": 2,
+    "browser.display.use_document_fonts": 0,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "media.peerconnection.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "privacy.trackingprotection.enabled": True,
+}
+
+# Requests to these hosts are sent to a closed local port and fail immediately.
+_BLOCKING_PAC = """
+function FindProxyForURL(url, host) {
+    var blocked = %s;
+    for (var i = 0; i < blocked.length; i++) {
+        if (host === blocked[i] || dnsDomainIs(host, "." + blocked[i])) {
+            return "PROXY 127.0.0.1:9";
+        }
+    }
+    return "DIRECT";
+}
+"""
+
+
+def _blocking_pac_url(hosts):
+    return "data:application/x-ns-proxy-autoconfig," + quote(_BLOCKING_PAC % json.dumps(list(hosts)))
+
+
+def build_firefox_options(lean=None):
+    options = Options()
+    if config.HEADLESS:
+        options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+
+    if config.LEAN_BROWSER if lean is None else lean:
+        for name, value in LEAN_PREFS.items():
+            options.set_preference(name, value)
+        if config.LEAN_DISABLE_CSS:
+            options.set_preference("permissions.default.stylesheet", 2)
+        if config.LEAN_BLOCKED_HOSTS:
+            options.set_preference("network.proxy.type", 2)
+            options.set_preference("network.proxy.autoconfig_url", _blocking_pac_url(config.LEAN_BLOCKED_HOSTS))
+    return options
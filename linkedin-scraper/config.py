@@ -1,11 +1,131 @@
 SEARCH_KEYWORDS = "Full Stack"
 LOCATION = "USA"
 PROFILES_TO_SCRAPE = 10
+# LinkedIn shows at most 100 pages of people search results
+MAX_SEARCH_PAGES = 100
+# Collection stops after this many consecutive result pages without profile links;
+# a page that fails to load is tried SEARCH_PAGE_ATTEMPTS times and then skipped
+SEARCH_EMPTY_PAGES_TO_STOP = 2
+SEARCH_PAGE_ATTEMPTS = 2
 # detailed, summary
 SCRAPE_MODE = "SUMMARY"
+# In DETAILED mode, load the experience/education/skills pages in parallel tabs
+DETAIL_TABS = True
 
 HEADLESS = True
 
+# Lean browser: block images, media, web fonts and the third-party hosts below.
+# Set LEAN_BROWSER = False to see pages exactly as LinkedIn serves them.
+LEAN_BROWSER = True
+# Also drop stylesheets. Faster, but lazy-loaded sections may not render without layout.
+LEAN_DISABLE_CSS = False
+LEAN_BLOCKED_HOSTS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "facebook.net",
+    "bat.bing.com",
+    "ads.linkedin.com",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "media.licdn.com",
+]
+
 OUTPUT_FILENAME = "demo.csv"
+# csv, jsonl or parquet (parquet needs pyarrow and writes a directory of part files)
+OUTPUT_FORMAT = "csv"
+# Profiles are appended to the output file in batches of this size
+OUTPUT_BATCH_SIZE = 10
+# Profiles that finish early wait for earlier ones to keep URL order; past this many, order is given up
+OUTPUT_MAX_HELD_BACK = 1000
 COOKIES_FILENAME = "cookies.json"
+# Set to "RECORD" to archive every fetched page for 'python main.py replay'
+SNAPSHOT_MODE = None
+SNAPSHOT_ARCHIVE = "snapshots.db"
+# Per-phase timing summary written at the end of every scrape
+METRICS_JSON_FILENAME = "metrics.json"
+METRICS_PROMETHEUS_FILENAME = "metrics.prom"
+# SQLite run journal used by 'scrape --resume'
+JOURNAL_FILENAME = "scrape_journal.db"
+# Journal shared by all jobs of 'python main.py batch'
+BATCH_JOURNAL_FILENAME = "batch_journal.db"
+
+# Remember every scraped profile across runs and skip it when collecting search results
+SKIP_SEEN_PROFILES = True
+SEEN_INDEX_FILENAME = "seen_urls.db"
+SEEN_BLOOM_FILENAME = "seen_urls.bloom"
+# Bloom filter sizing: about 12 MB on disk for 10 million URLs at a 1% false positive rate.
+# False positives only cost an extra SQLite lookup.
+SEEN_INDEX_CAPACITY = 10_000_000
+SEEN_INDEX_ERROR_RATE = 0.01
+
+# DETAILED mode: fingerprint each profile's top card and summary sections, and skip the
+# detail pages when they match the last scrape of that profile
+CHANGE_DETECTION = True
+FINGERPRINT_FILENAME = "profile_fingerprints.db"
 LOGIN_URL = "https://www.linkedin.com/login"
+BASE_URL = "https://www.linkedin.com/"
+
+# Attach to browsers kept warm by 'python main.py session start' when it is running
+USE_WARM_SESSION = True
+SESSION_FILENAME = "session.json"
+# Number of warm browsers the session daemon keeps open (match WORKERS)
+SESSION_SLOTS = 1
+# Seconds between the daemon's checks that idle browsers are still logged in
+SESSION_CHECK_INTERVAL = 300
+
+# Number of parallel browser workers used for profile scraping
+WORKERS = 1
+# How many times a URL is retried after its worker crashed
+MAX_URL_ATTEMPTS = 3
+# Replace a worker's browser with a fresh one after this many page loads (0 = never)
+RECYCLE_AFTER_PAGES = 200
+# ... or once the Firefox process tree uses this much memory in MB (0 = never)
+RECYCLE_RSS_MB = 1500
+
+# Adaptive waits: a page counts as settled once the DOM has not changed for
+# DOM_QUIET_MS milliseconds. WAIT_TIMEOUT and SCROLL_TIMEOUT (seconds) are hard caps.
+DOM_QUIET_MS = 500
+WAIT_TIMEOUT = 10
+SCROLL_TIMEOUT = 30
+# Fixed pause each worker takes between two profiles, on top of the rate limiter below
+PROFILE_DELAY = 0
+# Seconds before a page load counts as timed out (and as a throttling signal)
+PAGE_LOAD_TIMEOUT = 30
+
+# Adaptive rate limiter shared by all workers (pages per second, all workers combined).
+# The rate rises by THROTTLE_RATE_STEP per page while pages load faster than
+# THROTTLE_SLOW_LATENCY seconds, and drops on slow pages. A checkpoint/authwall redirect
+# or a timeout halves it and pauses all workers for THROTTLE_COOLDOWN seconds.
+THROTTLE_START_RATE = 0.5
+THROTTLE_MIN_RATE = 0.05
+THROTTLE_MAX_RATE = 2.0
+THROTTLE_RATE_STEP = 0.02
+THROTTLE_BURST = 2
+THROTTLE_SLOW_LATENCY = 4.0
+THROTTLE_COOLDOWN = 60
+
+# DRIVER: read each field with its own WebDriver call
+# SCRIPT: read all fields of a page with one injected script (much faster)
+# HTML: only capture page_source in the browser and parse it with lxml in a process pool
+EXTRACTION_MODE = "SCRIPT"
+# Number of parser processes for HTML mode (None = one per CPU)
+PARSE_PROCESSES = None
+# Hit counts of the DRIVER-mode selector fallbacks, kept between runs.
+# A selector that misses SELECTOR_DEMOTE_AFTER times in a row is tried after its fallbacks
+# (and again first every SELECTOR_RETRY_EVERY lookups) and reported at the end of a run.
+# One without fallbacks is reported after SELECTOR_DEAD_AFTER misses in a row.
+SELECTOR_STATS_FILENAME = "selector_stats.json"
+SELECTOR_DEAD_AFTER = 50
+SELECTOR_DEMOTE_AFTER = 5
+SELECTOR_RETRY_EVERY = 100
+
+# SUMMARY mode only: fetch profile pages over plain HTTP with the saved cookies first,
+# and only open the ones missing HTTP_REQUIRED_FIELDS, or all of HTTP_SECTION_FIELDS, in the browser
+HTTP_FAST_PATH = False
+HTTP_CONCURRENCY = 16
+HTTP_TIMEOUT = 15
+HTTP_REQUIRED_FIELDS = ["name", "headline"]
+HTTP_SECTION_FIELDS = ["experience", "education", "skills"]
+HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:140.0) Gecko/20100101 Firefox/140.0"
@@ -0,0 +1,43 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+# Last record of every profile, keyed by URL, with the fingerprint of the page it
+# was read from and the SCRAPE_MODE it was scraped in.
+class FingerprintStore:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                url TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                data TEXT NOT NULL,
+                scraped_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def unchanged(self, url, fingerprint, mode):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM fingerprints WHERE url = ? AND fingerprint = ? AND mode = ?",
+                (url, fingerprint, mode),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, url, fingerprint, mode, profile_data):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (url, fingerprint, mode, data, scraped_at) VALUES (?, ?, ?, ?, ?)",
+                (url, fingerprint, mode, json.dumps(profile_data), time.time()),
+            )
+
+    def close(self):
+        self.conn.close()
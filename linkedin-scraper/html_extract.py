@@ -0,0 +1,189 @@
+import json
+import re
+from urllib.parse import urljoin
+from lxml import html
+from utils import clean_profile_url
+
+HIDDEN = "span[aria-hidden='true']"
+TITLE = f"div.hoverable-link-text {HIDDEN}"
+SUBTITLE = f"span.t-14.t-normal {HIDDEN}"
+DETAILS_ITEM = "li.pvs-list__paged-list-item"
+
+
+def _text(element):
+    if element is None:
+        return ""
+    return " ".join(element.text_content().split())
+
+
+def _first(root, selector):
+    found = root.cssselect(selector)
+    return found[0] if found else None
+
+
+def _summary_section(doc, title):
+    headings = doc.xpath(f"//h2[contains(., '{title}')]")
+    if not headings:
+        return None
+    sections = headings[0].xpath("./ancestor::section")
+    return sections[0] if sections else None
+
+
+def _paired_items(section, joiner, limit):
+    result = []
+    for item in section.cssselect("li.artdeco-list__item"):
+        main = _first(item, TITLE)
+        sub = _first(item, SUBTITLE)
+        if main is not None and sub is not None:
+            first, second = _text(main), _text(sub)
+            result.append(f"{first}{joiner}{second}" if second else first)
+            continue
+        spans = item.cssselect(HIDDEN)
+        if not spans:
+            continue
+        first = _text(spans[0])
+        second = _text(spans[1]) if len(spans) > 1 else ""
+        full_text = f"{first}{joiner}{second}" if second else first
+        if full_text not in result:
+            result.append(full_text)
+    return result[:limit]
+
+
+def parse_top_card(doc, url, data, verbose=True):
+    name = _first(doc, "h1.text-heading-xlarge")
+    if name is None:
+        name = _first(doc, "main h1")
+    data["name"] = _text(name)
+    data["headline"] = _text(_first(doc, "div.text-body-medium.break-words"))
+    data["location"] = _text(_first(doc, "span.text-body-small.inline"))
+    for key in ("name", "headline", "location"):
+        if verbose and not data[key]:
+            print(f"[WARNING] Could not extract {key} for {url}")
+    return data
+
+
+def parse_summary_sections(doc, data, verbose=True):
+    experience = _summary_section(doc, "Experience")
+    if experience is None:
+        if verbose:
+            print("[INFO] Summary experience section not found on main page.")
+    else:
+        data["experience"] = " | ".join(_paired_items(experience, " at ", 5))
+
+    education = _summary_section(doc, "Education")
+    if education is None:
+        if verbose:
+            print("[INFO] Summary education section not found on main page.")
+    else:
+        data["education"] = " | ".join(_paired_items(education, " - ", 5))
+
+    skills = _summary_section(doc, "Skills")
+    if skills is None:
+        if verbose:
+            print("[INFO] Summary skills section not found on main page.")
+    else:
+        data["skills"] = " | ".join(_text(span) for span in skills.cssselect(TITLE)[:10])
+    return data
+
+
+def parse_details_page(page_source, kind):
+    doc = html.fromstring(page_source)
+    result = []
+    for item in doc.cssselect(DETAILS_ITEM):
+        if kind == "experience":
+            spans = item.cssselect(HIDDEN)
+            if not spans:
+                continue
+            title = _text(spans[0])
+            company = _text(spans[1]) if len(spans) > 1 else ""
+            result.append(f"{title} at {company}" if company else title)
+        elif kind == "education":
+            institution = _first(item, TITLE)
+            if institution is None:
+                continue
+            degree = _text(_first(item, SUBTITLE))
+            result.append(f"{_text(institution)} - {degree}" if degree else _text(institution))
+        else:
+            skill = _text(_first(item, TITLE))
+            if skill:
+                result.append(skill)
+    return result[:10] if kind == "skills" else result[:5]
+
+
+def parse_profile_page(page_source, url, include_sections=True, verbose=True):
+    data = {"url": url, "name": "", "headline": "", "location": "", "experience": "", "education": "", "skills": ""}
+    doc = html.fromstring(page_source)
+    parse_top_card(doc, url, data, verbose)
+    if include_sections:
+        parse_summary_sections(doc, data, verbose)
+    return data
+
+
+def parse_embedded_profile(page_source):
+    # Logged-in profile pages ship their data as JSON inside <code> tags and render it client-side.
+    doc = html.fromstring(page_source)
+    for code in doc.xpath("//code"):
+        try:
+            payload = json.loads(code.text_content())
+        except ValueError:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        for entity in payload.get("included", []):
+            if not isinstance(entity, dict) or not entity.get("firstName") or "headline" not in entity:
+                continue
+            location = entity.get("locationName") or entity.get("geoLocationName") or ""
+            if isinstance(entity.get("geoLocation"), dict):
+                location = location or entity["geoLocation"].get("defaultLocalizedName", "")
+            return {
+                "name": f"{entity['firstName']} {entity.get('lastName') or ''}".strip(),
+                "headline": entity.get("headline") or "",
+                "location": location,
+            }
+    return {}
+
+
+def parse_captured_profile(captured):
+    url = captured["url"]
+    details = captured.get("details")
+    if captured.get("profile") is None:
+        return {"url": url, "name": "", "headline": "", "location": "", "experience": "", "education": "", "skills": ""}
+
+    data = parse_profile_page(captured["profile"], url, include_sections=details is None)
+    for kind, page_source in (details or {}).items():
+        if page_source:
+            data[kind] = " | ".join(parse_details_page(page_source, kind))
+    return data
+
+
+def parse_search_page(page_source, base_url):
+    doc = html.fromstring(page_source)
+    links = doc.cssselect("a[data-test-app-aware-link][href*='/in/']")
+    if not links:
+        links = doc.xpath("//a[contains(@href, '/in/')]")
+
+    urls = []
+    for link in links:
+        clean_url = clean_profile_url(urljoin(base_url, link.get("href", "")))
+        if clean_url and clean_url not in urls:
+            urls.append(clean_url)
+    return urls
+
+
+def guess_page_url(page_source):
+    doc = html.fromstring(page_source)
+    for selector in ("link[rel='canonical']", "meta[property='og:url']"):
+        element = _first(doc, selector)
+        if element is not None:
+            return element.get("href") or element.get("content") or ""
+    return ""
+
+
+def parse_saved_page(path):
+    with open(path, "r", encoding="utf-8") as f:
+        page_source = f.read()
+    url = guess_page_url(page_source)
+    match = re.search(r"/details/(experience|education|skills)/", url)
+    if match:
+        return {"url": url, match.group(1): " | ".join(parse_details_page(page_source, match.group(1)))}
+    return parse_profile_page(page_source, url)
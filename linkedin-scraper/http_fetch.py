@@ -0,0 +1,74 @@
+import json
+import time
+import urllib3
+import config
+from html_extract import parse_embedded_profile, parse_profile_page
+from metrics import METRICS, span
+from throttle import LIMITER, is_logged_out_url
+
+
+# Fetches profile pages without a browser, reusing the cookies saved by 'main.py login'.
+class HttpProfileFetcher:
+    def __init__(self, cookies_path, concurrency):
+        with open(cookies_path, "r") as f:
+            cookies = json.load(f)
+        jar = {cookie["name"]: cookie["value"] for cookie in cookies if "linkedin.com" in cookie.get("domain", "linkedin.com")}
+        self.headers = {
+            "User-Agent": config.HTTP_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Cookie": "; ".join(f"{name}={value}" for name, value in jar.items()),
+        }
+        csrf_token = jar.get("JSESSIONID", "").strip('"')
+        if csrf_token:
+            self.headers["csrf-token"] = csrf_token
+        # One keep-alive pool per host, shared by all fetch threads.
+        self.http = urllib3.PoolManager(
+            maxsize=concurrency,
+            block=True,
+            retries=urllib3.Retry(total=2, redirect=5, backoff_factor=0.5),
+            timeout=urllib3.Timeout(connect=5, read=config.HTTP_TIMEOUT),
+        )
+
+    def fetch(self, url):
+        LIMITER.acquire()
+        started = time.monotonic()
+        try:
+            with span("http.fetch"):
+                response = self.http.request("GET", url, headers=self.headers)
+        except urllib3.exceptions.TimeoutError:
+            LIMITER.back_off(f"HTTP request timed out: {url}")
+            raise
+        final_url = response.geturl() or url
+        LIMITER.record(time.monotonic() - started, final_url)
+        if response.status == 429:
+            LIMITER.back_off(f"HTTP 429 for {url}")
+        if is_logged_out_url(final_url):
+            METRICS.increment("http_logged_out")
+            return None
+        if response.status != 200:
+            METRICS.increment("http_errors")
+            return None
+        return response.data.decode("utf-8", errors="replace")
+
+    def scrape(self, url):
+        page_source = self.fetch(url)
+        if page_source is None:
+            return None
+        with span("http.parse"):
+            data = parse_profile_page(page_source, url, verbose=False)
+            for key, value in parse_embedded_profile(page_source).items():
+                if not data[key]:
+                    data[key] = value
+        return data
+
+    def close(self):
+        self.http.clear()
+
+
+def has_required_fields(profile_data):
+    # The embedded JSON only covers the top card; a page whose sections did not
+    # come with the HTML has to be rendered in the browser.
+    return all(profile_data.get(field) for field in config.HTTP_REQUIRED_FIELDS) and any(
+        profile_data.get(field) for field in config.HTTP_SECTION_FIELDS
+    )
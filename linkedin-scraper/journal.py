@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class RunJournal:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS run (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS urls (position INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL);
+            CREATE TABLE IF NOT EXISTS profiles (
+                url TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                scraped_at REAL NOT NULL
+            );
+            """
+        )
+        self.conn.commit()
+
+    def reset(self, search_url):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM run")
+            self.conn.execute("DELETE FROM urls")
+            self.conn.execute("DELETE FROM profiles")
+            self.conn.execute("INSERT INTO run (key, value) VALUES ('search_url', ?)", (search_url,))
+
+    def search_url(self):
+        row = self.conn.execute("SELECT value FROM run WHERE key = 'search_url'").fetchone()
+        return row[0] if row else None
+
+    def save_urls(self, urls):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM urls")
+            self.conn.executemany(
+                "INSERT INTO urls (position, url) VALUES (?, ?)",
+                list(enumerate(urls)),
+            )
+
+    def load_urls(self):
+        rows = self.conn.execute("SELECT url FROM urls ORDER BY position").fetchall()
+        return [row[0] for row in rows]
+
+    def record_profile(self, profile_data):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profiles (url, data, scraped_at) VALUES (?, ?, ?)",
+                (profile_data["url"], json.dumps(profile_data), time.time()),
+            )
+
+    def completed_urls(self):
+        return {row[0] for row in self.conn.execute("SELECT url FROM profiles")}
+
+    def profiles_in_order(self):
+        rows = self.conn.execute(
+            "SELECT profiles.data FROM urls JOIN profiles ON profiles.url = urls.url ORDER BY urls.position"
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def profiles_by_url(self):
+        rows = self.conn.execute("SELECT url, data FROM profiles").fetchall()
+        return {url: json.loads(data) for url, data in rows}
+
+    def start_job(self, name, urls):
+        # The URLs of the batch job in progress, so a resumed batch does not collect them again.
+        self.save_urls(urls)
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO run (key, value) VALUES ('current_job', ?)", (name,))
+
+    def current_job(self):
+        row = self.conn.execute("SELECT value FROM run WHERE key = 'current_job'").fetchone()
+        return row[0] if row else None
+
+    def finish_job(self, name, urls):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO run (key, value) VALUES (?, ?)",
+                (f"job:{name}", json.dumps(urls)),
+            )
+
+    def finished_jobs(self):
+        rows = self.conn.execute("SELECT key, value FROM run WHERE key LIKE 'job:%'").fetchall()
+        return {key[len("job:"):]: json.loads(value) for key, value in rows}
+
+    def close(self):
+        self.conn.close()
+
+
+def read_profiles(path):
+    # Every profile in a journal file, opened read-only so exporting never changes it. Profiles
+    # of the current URL list come first in its order, then the rest (earlier batch jobs) in the
+    # order they were scraped.
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "profiles" not in tables:
+            raise ValueError(f"'{path}' is not a run journal")
+        if "urls" in tables:
+            query = (
+                "SELECT profiles.data FROM profiles LEFT JOIN urls ON urls.url = profiles.url "
+                "ORDER BY urls.position IS NULL, urls.position, profiles.scraped_at"
+            )
+        else:
+            query = "SELECT data FROM profiles ORDER BY scraped_at"
+        return [json.loads(row[0]) for row in conn.execute(query)]
+    finally:
+        conn.close()
@@ -1,26 +1,134 @@
 import argparse
-from auth import LinkedInAuth
-from scraper import LinkedInScraper
-import getpass
+import json
+import config
 
-def main():
-    parser = argparse.ArgumentParser(description="LinkedIn Scraper Tool")
-    parser.add_argument('action', choices=['login', 'scrape'], help="Action to perform: 'login' to save cookies, 'scrape' to start scraping.")
-    
-    args = parser.parse_args()
-
-    if args.action == 'login':
-        username = input("Enter your LinkedIn username or email: ")
-        password = getpass.getpass("Enter your LinkedIn password: ")
-        if username and password:
-            auth = LinkedInAuth(username, password)
-            auth.login()
+# Each action imports only what it needs, so cheap actions such as 'status'
+# and 'export' start without loading Selenium. benchmarks/import_time.py
+# checks that this stays true.
+
+
+def _login(args):
+    import getpass
+    from auth import LinkedInAuth
+
+    username = input("Enter your LinkedIn username or email: ")
+    password = getpass.getpass("Enter your LinkedIn password: ")
+    if username and password:
+        auth = LinkedInAuth(username, password)
+        auth.login()
+    else:
+        print("[ERROR] Username and password cannot be empty. Aborting.")
+
+
+def _scrape(args):
+    from scraper import LinkedInScraper
+
+    scraper = LinkedInScraper()
+    scraper.scrape_profiles(resume=args.resume, quiet=args.quiet)
+
+
+def _batch(args):
+    from batch import run_batch
+
+    if not args.targets:
+        print("[ERROR] No jobs file given. Usage: python main.py batch jobs.yaml")
+        return
+    run_batch(args.targets[0], resume=args.resume, quiet=args.quiet)
+
+
+def _parse(args):
+    from html_extract import parse_saved_page
+
+    if not args.targets:
+        print("[ERROR] No files given. Usage: python main.py parse debug_fatal_error_page_source.html")
+        return
+    for path in args.targets:
+        print(json.dumps(parse_saved_page(path), indent=2, ensure_ascii=False))
+
+
+def _replay(args):
+    from replay import replay_snapshots
+
+    replay_snapshots(config.SNAPSHOT_ARCHIVE, args.output, compare_path=args.compare)
+
+
+def _session(args):
+    from session import print_status, start_daemon, stop_daemon
+
+    command = args.targets[0] if args.targets else 'status'
+    if command == 'start':
+        start_daemon()
+    elif command == 'stop':
+        stop_daemon()
+    elif command == 'status':
+        print_status()
+    else:
+        print(f"[ERROR] Unknown session command '{command}'. Use 'start', 'stop' or 'status'.")
+
+
+def _status(args):
+    from status import print_status
+
+    print_status()
+
+
+def _export(args):
+    import os
+    import sqlite3
+    from sinks import format_for_path, open_sink, read_rows
+
+    if len(args.targets) != 2:
+        print("[ERROR] Usage: python main.py export <input> <output>, e.g. export demo.csv demo.jsonl")
+        return
+    source, target = args.targets
+    if not os.path.exists(source):
+        print(f"[ERROR] '{source}' not found.")
+        return
+    # Opening the target truncates it before the source is read.
+    if os.path.realpath(source) == os.path.realpath(target):
+        print("[ERROR] The output must be a different file from the input.")
+        return
+    try:
+        if source.endswith(".db"):
+            # A run journal: export every finished profile in URL order.
+            from journal import read_profiles
+
+            rows = read_profiles(source)
         else:
-            print("[ERROR] Username and password cannot be empty. Aborting.")
-    
-    elif args.action == 'scrape':
-        scraper = LinkedInScraper()
-        scraper.scrape_profiles()
+            rows = read_rows(source)
+        sink = open_sink(format_for_path(target), target, config.OUTPUT_BATCH_SIZE)
+        for row in rows:
+            sink.write(row)
+        sink.close()
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"[ERROR] Export failed: {e}")
+        return
+    print(f"[SUCCESS] Exported {sink.count} profiles from '{source}' to '{target}'")
+
+
+ACTIONS = {
+    'login': _login,
+    'scrape': _scrape,
+    'batch': _batch,
+    'parse': _parse,
+    'replay': _replay,
+    'session': _session,
+    'status': _status,
+    'export': _export,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LinkedIn Scraper Tool")
+    parser.add_argument('action', choices=list(ACTIONS), help="Action to perform: 'login' to save cookies, 'scrape' to start scraping, 'batch' to run the search jobs in a YAML file, 'parse' to re-parse saved page sources, 'replay' to re-run extraction on recorded snapshots, 'session' to manage the warm browser daemon, 'status' to show cookies, outputs and the last run, 'export' to convert an output to another format.")
+    parser.add_argument('--resume', action='store_true', help="Continue the last 'scrape' or 'batch' run from its journal instead of starting over.")
+    parser.add_argument('--quiet', action='store_true', help="Print one line per scraped profile instead of the full record.")
+    parser.add_argument('--output', default="replay.jsonl", help="JSONL file written by 'replay'.")
+    parser.add_argument('--compare', help="Earlier 'replay' output to compare the new results against.")
+    parser.add_argument('targets', nargs='*', help="Jobs file for 'batch'; saved '*_page_source.html' files for 'parse'; 'start', 'stop' or 'status' for 'session'; input and output paths for 'export'.")
+
+    args = parser.parse_args(argv)
+    ACTIONS[args.action](args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,144 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation.
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "mean_s": round(self.total / self.count, 4) if self.count else 0.0,
+            "min_s": round(self.min or 0.0, 4),
+            "max_s": round(self.max or 0.0, 4),
+            "p50_s": self.quantile(0.5),
+            "p90_s": self.quantile(0.9),
+            "p99_s": self.quantile(0.99),
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "spans": {name: h.summary() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP linkedin_scraper_span_seconds Time spent per scraper phase.",
+            "# TYPE linkedin_scraper_span_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), h.counts):
+                    cumulative += count
+                    lines.append(f'linkedin_scraper_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'linkedin_scraper_span_seconds_sum{{span="{name}"}} {h.total:.6f}')
+                lines.append(f'linkedin_scraper_span_seconds_count{{span="{name}"}} {h.count}')
+            if self.counters:
+                lines.append("# HELP linkedin_scraper_events_total Scraper events.")
+                lines.append("# TYPE linkedin_scraper_events_total counter")
+                for name, value in sorted(self.counters.items()):
+                    lines.append(f'linkedin_scraper_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path, prometheus_path):
+        with open(json_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(prometheus_path, "w") as f:
+            f.write(self.to_prometheus())
+
+    def print_summary(self):
+        spans = self.to_dict()["spans"]
+        if not spans:
+            return
+        print("\n--- Time per phase ---")
+        print(f"{'Span':<32} {'Count':>6} {'Total (s)':>10} {'Mean (s)':>9} {'p90 (s)':>8}")
+        for name, s in sorted(spans.items(), key=lambda item: -item[1]["total_s"]):
+            print(f"{name:<32} {s['count']:>6} {s['total_s']:>10.2f} {s['mean_s']:>9.3f} {s['p90_s']:>8.3f}")
+        if self.counters:
+            print("\n--- Counters ---")
+            for name, value in sorted(self.counters.items()):
+                print(f"{name:<32} {value:>6}")
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(name, time.perf_counter() - started)
+
+
+def timed(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,144 @@
+import hashlib
+import config
+from metrics import span, timed
+from waits import scroll_until_stable
+
+# Mirrors the selector fallbacks of the find_element based extractors in utils.py,
+# but runs entirely inside the page so each page costs a single WebDriver call.
+_SHARED_JS = """
+const HIDDEN = "span[aria-hidden='true']";
+const TITLE = "div.hoverable-link-text " + HIDDEN;
+const SUBTITLE = "span.t-14.t-normal " + HIDDEN;
+
+function text(el) {
+    return el ? (el.innerText || "").trim() : "";
+}
+function first(root, selector) {
+    return root.querySelector(selector);
+}
+function sectionFor(heading) {
+    // Same as XPath ./ancestor::section with find_element: the outermost section.
+    let found = null;
+    for (let el = heading.parentElement; el; el = el.parentElement) {
+        if (el.tagName === "SECTION") found = el;
+    }
+    return found;
+}
+function summarySection(title) {
+    for (const h2 of document.querySelectorAll("h2")) {
+        if ((h2.textContent || "").includes(title)) return sectionFor(h2);
+    }
+    return null;
+}
+function pairedItems(section, joiner, limit) {
+    const result = [];
+    for (const item of section.querySelectorAll("li.artdeco-list__item")) {
+        const main = first(item, TITLE);
+        const sub = first(item, SUBTITLE);
+        if (main && sub) {
+            const a = text(main), b = text(sub);
+            result.push(b ? a + joiner + b : a);
+            continue;
+        }
+        const spans = item.querySelectorAll(HIDDEN);
+        if (!spans.length) continue;
+        const a = text(spans[0]), b = spans.length > 1 ? text(spans[1]) : "";
+        const full = b ? a + joiner + b : a;
+        if (!result.includes(full)) result.push(full);
+    }
+    return result.slice(0, limit);
+}
+"""
+
+_PROFILE_JS = _SHARED_JS + """
+const includeSections = arguments[0];
+const nameEl = first(document, "h1.text-heading-xlarge") || first(document, "main h1");
+const data = {
+    name: text(nameEl),
+    headline: text(first(document, "div.text-body-medium.break-words")),
+    location: text(first(document, "span.text-body-small.inline")),
+    experience: null,
+    education: null,
+    skills: null,
+};
+if (includeSections) {
+    const experience = summarySection("Experience");
+    if (experience) data.experience = pairedItems(experience, " at ", 5);
+    const education = summarySection("Education");
+    if (education) data.education = pairedItems(education, " - ", 5);
+    const skills = summarySection("Skills");
+    if (skills) data.skills = Array.from(skills.querySelectorAll(TITLE), text).slice(0, 10);
+}
+return data;
+"""
+
+_DETAILS_JS = _SHARED_JS + """
+const kind = arguments[0];
+const result = [];
+for (const item of document.querySelectorAll("li.pvs-list__paged-list-item")) {
+    if (kind === "experience") {
+        const spans = item.querySelectorAll(HIDDEN);
+        if (!spans.length) continue;
+        const title = text(spans[0]), company = spans.length > 1 ? text(spans[1]) : "";
+        result.push(company ? title + " at " + company : title);
+    } else if (kind === "education") {
+        const institution = first(item, TITLE);
+        if (!institution) continue;
+        const degree = text(first(item, SUBTITLE));
+        result.push(degree ? text(institution) + " - " + degree : text(institution));
+    } else {
+        const skill = text(first(item, TITLE));
+        if (skill) result.push(skill);
+    }
+}
+return result.slice(0, kind === "skills" ? 10 : 5);
+"""
+
+# Visible text of the top card and the summary sections, the parts of a profile
+# that change when its detail pages do.
+_FINGERPRINT_JS = _SHARED_JS + """
+const parts = [
+    text(first(document, "h1.text-heading-xlarge") || first(document, "main h1")),
+    text(first(document, "div.text-body-medium.break-words")),
+    text(first(document, "span.text-body-small.inline")),
+];
+for (const title of ["Experience", "Education", "Skills"]) {
+    parts.push(text(summarySection(title)));
+}
+return parts;
+"""
+
+@timed("fingerprint.profile")
+def profile_fingerprint(driver):
+    parts = driver.execute_script(_FINGERPRINT_JS) or []
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+@timed("extract.details_script")
+def extract_details_script(driver, kind):
+    return driver.execute_script(_DETAILS_JS, kind) or []
+
+
+def extract_profile_fields_script(driver, url, data):
+    include_sections = config.SCRAPE_MODE != "DETAILED"
+    if include_sections:
+        print("[INFO] Running in SUMMARY mode.")
+        print("[INFO] Scrolling to load all page content...")
+        scroll_until_stable(driver, "section li.artdeco-list__item")
+
+    with span("extract.profile_script"):
+        fields = driver.execute_script(_PROFILE_JS, include_sections)
+
+    for key in ("name", "headline", "location"):
+        data[key] = fields.get(key) or ""
+        if not data[key]:
+            print(f"[WARNING] Could not extract {key} for {url}")
+
+    if include_sections:
+        for key in ("experience", "education", "skills"):
+            items = fields.get(key)
+            if items is None:
+                print(f"[INFO] Summary {key} section not found on main page.")
+            elif items:
+                data[key] = " | ".join(items)
+
+    return data
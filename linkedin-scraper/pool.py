@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from concurrent.futures import wait
+from functools import partial
+import config
+from metrics import METRICS, span
+
+
+class ScraperPool:
+    def __init__(self, size, max_attempts=None):
+        self.size = max(1, size)
+        self.max_attempts = max_attempts or config.MAX_URL_ATTEMPTS
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._pending = []
+        # Browsers started by the pool stay open between runs until close().
+        self._idle = []
+
+    def stop(self):
+        self._stopped.set()
+
+    def _spawn_worker(self, worker_id, seed):
+        worker = seed._new_worker()
+        try:
+            if worker._start_session():
+                print(f"[INFO] Worker {worker_id} ready.")
+                return worker
+        except Exception as e:
+            print(f"[ERROR] Worker {worker_id} could not start a browser: {e}")
+        self._retire(worker)
+        return None
+
+    def _retire(self, worker):
+        if worker.driver:
+            try:
+                worker.driver.quit()
+            except Exception:
+                pass
+            worker.driver = None
+
+    def _restart(self, worker_id, worker):
+        self._retire(worker)
+        try:
+            if worker._start_session():
+                print(f"[INFO] Worker {worker_id} replaced with a fresh browser.")
+                return worker
+        except Exception as e:
+            print(f"[ERROR] Worker {worker_id} could not be replaced: {e}")
+        self._retire(worker)
+        return None
+
+    def _deliver(self, index, result, results, on_result):
+        results[index] = result
+        if on_result:
+            with self._lock:
+                on_result(index, result)
+
+    def _give_up(self, index, url, on_give_up):
+        METRICS.increment("urls_abandoned")
+        if on_give_up:
+            with self._lock:
+                on_give_up(index, url)
+
+    def _collect_parsed(self, index, url, results, on_result, on_give_up, future):
+        try:
+            profile_data = future.result()
+        except Exception as e:
+            print(f"[ERROR] Could not parse captured pages for {url}: {e}")
+            self._give_up(index, url, on_give_up)
+            return
+        self._deliver(index, profile_data, results, on_result)
+
+    def _worker_loop(self, worker_id, seed, worker, task, tasks, results, on_result, on_give_up, parse_executor):
+        owned = worker is not seed
+        while not self._stopped.is_set():
+            try:
+                index, url, attempts = tasks.get_nowait()
+            except queue.Empty:
+                break
+
+            if worker is None:
+                worker = self._spawn_worker(worker_id, seed)
+                if worker is None:
+                    tasks.put((index, url, attempts))
+                    break
+
+            try:
+                worker._recycle_driver_if_needed()
+                result = getattr(worker, task)(url)
+                if parse_executor:
+                    # The browser only captured HTML; parsing happens off this thread.
+                    from html_extract import parse_captured_profile
+
+                    future = parse_executor.submit(parse_captured_profile, result)
+                    future.add_done_callback(partial(self._collect_parsed, index, url, results, on_result, on_give_up))
+                    self._pending.append(future)
+                else:
+                    self._deliver(index, result, results, on_result)
+                if config.PROFILE_DELAY:
+                    with span("delay.profile"):
+                        time.sleep(config.PROFILE_DELAY)
+            except Exception as e:
+                attempts += 1
+                METRICS.increment("worker_crashes")
+                print(f"[WARNING] Worker {worker_id} crashed on {url} (attempt {attempts}/{self.max_attempts}): {e}")
+                if attempts < self.max_attempts:
+                    tasks.put((index, url, attempts))
+                else:
+                    print(f"[ERROR] Giving up on {url} after {attempts} attempts.")
+                    self._give_up(index, url, on_give_up)
+                worker = self._restart(worker_id, worker)
+                if worker is None:
+                    break
+
+        if owned and worker is not None:
+            with self._lock:
+                self._idle.append(worker)
+
+    # `on_give_up(index, url)` is called for URLs that will never produce a result.
+    def run(self, scraper, urls, on_result=None, task="_scrape_profile", parse_executor=None, on_give_up=None):
+        self._stopped.clear()
+        self._pending = []
+        tasks = queue.Queue()
+        for index, url in enumerate(urls):
+            tasks.put((index, url, 0))
+        results = [None] * len(urls)
+
+        threads = []
+        for worker_id in range(min(self.size, len(urls))):
+            # The first worker reuses the scraper's own (already authenticated) browser.
+            if worker_id == 0:
+                worker = scraper
+            else:
+                with self._lock:
+                    worker = self._idle.pop() if self._idle else None
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(worker_id, scraper, worker, task, tasks, results, on_result, on_give_up, parse_executor),
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+        wait(self._pending)
+
+        if not tasks.empty() and not self._stopped.is_set():
+            print(f"[ERROR] {tasks.qsize()} URLs were left unscraped because no worker could be started.")
+
+        return [result for result in results if result is not None]
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._retire(worker)
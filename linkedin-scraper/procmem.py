@@ -0,0 +1,80 @@
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def pid_alive(pid):
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _children_from_proc(pid):
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces; the parent pid follows its closing parenthesis.
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def _rss_from_proc(pid):
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def process_tree_rss(pid):
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    if not os.path.isdir("/proc"):
+        return 0
+    return sum(_rss_from_proc(child) for child in _children_from_proc(pid))
+
+
+def browser_rss(driver):
+    # geckodriver is the root of the Firefox process tree. Warm browsers attached from
+    # the session daemon have no service of their own and carry the daemon's pid instead.
+    pid = getattr(driver, "driver_pid", None)
+    if pid is None:
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None) if service else None
+        if process is None:
+            return 0
+        pid = process.pid
+    return process_tree_rss(pid)
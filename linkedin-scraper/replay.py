@@ -0,0 +1,97 @@
+import collections
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import config
+from html_extract import parse_captured_profile, parse_search_page
+from sinks import PROFILE_FIELDS, JsonlSink
+from snapshots import SnapshotStore
+
+
+def _load_baseline(path):
+    baseline = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                baseline[row["url"]] = row
+    return baseline
+
+
+class _Comparison:
+    # Compares replayed profiles with the baseline one at a time, so only the baseline is kept in memory.
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.changed_fields = {field: 0 for field in PROFILE_FIELDS}
+        self.changed_profiles = 0
+        self.profiles = 0
+        self.seen = set()
+
+    def add(self, profile_data):
+        self.profiles += 1
+        previous = self.baseline.get(profile_data["url"])
+        if previous is None:
+            return
+        self.seen.add(profile_data["url"])
+        diff = [field for field in PROFILE_FIELDS if previous.get(field, "") != profile_data.get(field, "")]
+        if diff:
+            self.changed_profiles += 1
+            for field in diff:
+                self.changed_fields[field] += 1
+
+    def print_summary(self):
+        missing = len(set(self.baseline) - self.seen)
+        print("\n--- Comparison with baseline ---")
+        print(f"Profiles changed: {self.changed_profiles}/{self.profiles}")
+        for field, count in self.changed_fields.items():
+            if count:
+                print(f"  {field:<12} changed in {count} profiles")
+        if missing:
+            print(f"Profiles in baseline but not in archive: {missing}")
+
+
+def replay_snapshots(archive, output_path, compare_path=None):
+    if not os.path.exists(archive):
+        print(f"[ERROR] Snapshot archive '{archive}' not found. Record one with SNAPSHOT_MODE = \"RECORD\".")
+        return
+
+    store = SnapshotStore(archive)
+    try:
+        started = time.perf_counter()
+        search_urls = store.urls("search")
+        found = set()
+        for url in search_urls:
+            found.update(parse_search_page(store.latest(url), url))
+        print(f"[INFO] {len(search_urls)} search pages yield {len(found)} profile URLs.")
+
+        comparison = _Comparison(_load_baseline(compare_path)) if compare_path else None
+        sink = JsonlSink(output_path, config.OUTPUT_BATCH_SIZE)
+
+        def write(profile_data):
+            sink.write(profile_data)
+            if comparison:
+                comparison.add(profile_data)
+
+        # executor.map would submit the whole archive at once; keep a bounded window of
+        # captures in flight instead, in archive order.
+        processes = config.PARSE_PROCESSES or os.cpu_count() or 1
+        window = processes * 16
+        pending = collections.deque()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for url in store.urls("profile"):
+                pending.append(executor.submit(parse_captured_profile, store.load_capture(url)))
+                if len(pending) >= window:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+        sink.close()
+        elapsed = time.perf_counter() - started
+    finally:
+        store.close()
+
+    rate = sink.count / elapsed if elapsed else 0
+    print(f"[SUCCESS] Replayed {sink.count} profiles in {elapsed:.2f}s ({rate:.1f} profiles/s) into '{output_path}'.")
+
+    if comparison:
+        comparison.print_summary()
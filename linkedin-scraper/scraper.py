@@ -1,19 +1,43 @@
 import json
-import time
-import pandas as pd
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 import config
-from utils import build_search_url, extract_profile_data
+from browser import build_firefox_options
+from fingerprints import FingerprintStore
+from journal import RunJournal
+from pool import ScraperPool
+from seen_index import SeenIndex
+from selector_registry import REGISTRY
+from session import AttachedFirefox, attach_to_session, session_is_valid
+from sinks import OrderedWriter, open_sink
+from snapshots import SnapshotStore
+from metrics import METRICS, span, timed
+from throttle import LIMITER
+from utils import DETAIL_KINDS, build_search_url, capture_profile_pages, clean_profile_url, extract_profile_data, navigate
+from waits import wait_for_dom_quiet, scroll_until_stable
+from watchdog import DriverWatchdog
+
+_PARSE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
 
 class LinkedInScraper:
-    def __init__(self):
+    def __init__(self, snapshots=None):
         self.driver = None
+        self.snapshots = snapshots
         self.profile_urls = []
+        self.journal = None
+        self.pool = None
+        self.quiet = False
+        self.output = None
+        self._positions = {}
+        self._done = 0
+        self.seen = None
+        self.fingerprints = None
+        self.watchdog = DriverWatchdog()
 
     def _save_debug_info(self, driver, filename_prefix):
         try:
@@ -29,15 +53,17 @@ class LinkedInScraper:
         except Exception as e:
             print(f"[ERROR] Could not save debug info: {e}")
 
-    def _setup_driver(self):
-        options = Options()
-        if config.HEADLESS:
-            options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        self.driver = webdriver.Firefox(options=options)
+    def _launch_driver(self):
+        self.driver = webdriver.Firefox(options=build_firefox_options())
         self.driver.set_window_size(1920, 1080)
 
+    def _setup_driver(self, warm=True):
+        self.driver = attach_to_session() if config.USE_WARM_SESSION and warm else None
+        if self.driver is None:
+            self._launch_driver()
+        self.driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+
+    @timed("cookies.load")
     def _load_cookies(self):
         try:
             with open(config.COOKIES_FILENAME, "r") as f:
@@ -59,154 +85,429 @@ class LinkedInScraper:
             print(f"[ERROR] '{config.COOKIES_FILENAME}' not found. Please run the login process first.")
             return False
 
-    def _get_profile_urls(self, search_url):
-        self.driver.get(search_url)
-        print(f"Navigated to search results page: {self.driver.current_url}")
-        
-        urls = set()
-        page_number = 1
+    def _new_worker(self):
+        worker = LinkedInScraper(snapshots=self.snapshots)
+        worker.fingerprints = self.fingerprints
+        worker.seen = self.seen
+        return worker
 
-        while len(urls) < config.PROFILES_TO_SCRAPE:
-            print(f"\nScraping page {page_number}...")
-            
+    def _captures_html(self):
+        return config.EXTRACTION_MODE == "HTML" or self.snapshots is not None
+
+    def _start_session(self, warm=True):
+        self.watchdog.reset()
+        self._setup_driver(warm)
+        if isinstance(self.driver, AttachedFirefox):
+            if session_is_valid(self.driver):
+                return True
+            print("[WARNING] Warm browser session is logged out. Loading saved cookies instead.")
+
+        navigate(self.driver, config.BASE_URL)
+        if not self._load_cookies():
+            return False
+        if not session_is_valid(self.driver):
+            print(f"[ERROR] The cookies in '{config.COOKIES_FILENAME}' have expired. Please run the login process again.")
+            return False
+        return True
+
+    def _recycle_driver_if_needed(self):
+        if self.driver is None:
+            return
+        reason = self.watchdog.recycle_reason(self.driver)
+        if reason is None:
+            return
+        print(f"[INFO] Recycling the browser: {reason}.")
+        METRICS.increment("driver_recycles")
+        with span("driver.recycle"):
+            if isinstance(self.driver, AttachedFirefox):
+                # Let the session daemon replace its browser too, not just this run's.
+                try:
+                    self.driver.request_recycle()
+                except OSError as e:
+                    print(f"[WARNING] Could not ask the session daemon to replace its browser: {e}")
             try:
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "search-results-container"))
-                )
-                time.sleep(3)
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+            # Always a browser of our own: a warm one would come back with the same memory.
+            if not self._start_session(warm=False):
+                raise RuntimeError("Could not start a fresh browser session.")
+
+    def _load_search_page(self, page_url):
+        for attempt in range(1, config.SEARCH_PAGE_ATTEMPTS + 1):
+            self.watchdog.page_loaded()
+            METRICS.increment("search_pages")
+            try:
+                navigate(self.driver, page_url)
+                with span("wait.search_results"):
+                    WebDriverWait(self.driver, 15).until(
+                        EC.presence_of_element_located((By.CLASS_NAME, "search-results-container"))
+                    )
+                wait_for_dom_quiet(self.driver)
+                return True
             except TimeoutException:
-                print("[ERROR] Timed out waiting for search results container.")
-                self._save_debug_info(self.driver, "debug_timeout_page")
-                break
+                print(f"[ERROR] Timed out waiting for search results (attempt {attempt}/{config.SEARCH_PAGE_ATTEMPTS}): {page_url}")
+        self._save_debug_info(self.driver, "debug_timeout_page")
+        return False
 
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+    def _scrape_search_page(self, page_url):
+        # None means the page could not be loaded, [] that it has no results.
+        if not self._load_search_page(page_url):
+            METRICS.increment("search_pages_failed")
+            return None
 
-            links = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "a[data-test-app-aware-link][href*='/in/']",
-            )
+        scroll_until_stable(self.driver, "a[href*='/in/']")
+        if self.snapshots:
+            self.snapshots.record(self.driver.current_url, "search", self.driver.page_source)
 
+        links = REGISTRY.find_all(self.driver, "search.profile_links")
+        if not links:
+            print(f"[INFO] No profile links on {page_url}.")
+            return []
+
+        page_urls = []
+        for link in links:
+            try:
+                clean_url = clean_profile_url(link.get_attribute('href'))
+                if clean_url and clean_url not in page_urls:
+                    page_urls.append(clean_url)
+            except Exception as e:
+                print(f"Error processing a link element: {e}")
+        return page_urls
+
+    def _get_profile_urls(self, keywords, location, limit=None, journaled=()):
+        # `journaled` URLs are in the seen index but are kept: their records are already in
+        # the journal and are written to this output too (profiles shared by batch jobs).
+        limit = limit or config.PROFILES_TO_SCRAPE
+        # Result pages are addressed directly by number and fetched by all workers at once.
+        page_urls = [
+            build_search_url(keywords, location, page)
+            for page in range(1, config.MAX_SEARCH_PAGES + 1)
+        ]
+        urls = []
+        found = set()
+        known = set()
+        empty_pages = set()
+        last_with_results = [-1]
+
+        def on_page(index, links):
+            if links is None:
+                print(f"Page {index + 1}: skipped, it did not load.")
+                return
             if not links:
-                print("Selector 1 failed. Trying Selector 2 (for any /in/ links)...")
-                links = self.driver.find_elements(
-                    By.XPATH,
-                    "//a[contains(@href, '/in/')]",
-                )
+                empty_pages.add(index)
+                # Pages finish out of order, so one empty page is not the end of the results;
+                # a run of consecutive empty pages after the last page with results is.
+                run = config.SEARCH_EMPTY_PAGES_TO_STOP
+                starts = range(max(index - run + 1, last_with_results[0] + 1), index + 1)
+                if any(all(start + offset in empty_pages for offset in range(run)) for start in starts):
+                    print(f"[INFO] {run} result pages in a row are empty. Assuming the end of the results.")
+                    self.pool.stop()
+                return
+            new_links = [url for url in links if url not in found and url not in known]
+            if self.seen is not None:
+                known.update(url for url in new_links if url not in journaled and url in self.seen)
+                new_links = [url for url in new_links if url not in known]
+            found.update(new_links)
+            last_with_results[0] = max(last_with_results[0], index)
+            print(f"Page {index + 1}: {len(new_links)} new profiles ({len(found)} unique so far).")
+            if len(found) >= limit:
+                self.pool.stop()
 
+        pages = self.pool.run(self, page_urls, on_result=on_page, task="_scrape_search_page")
+
+        # Pages can finish out of order; keep the result order of the search itself.
+        for links in pages:
             if not links:
-                print("[ERROR] Both selectors failed. Could not find any profile links.")
-                self._save_debug_info(self.driver, "debug_link_finding_failed")
-                break
-                
-            for link in links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and '/in/' in href and '/search/' not in href:
-                        clean_url = href.split('?')[0]
-                        if clean_url not in urls and clean_url.count('/in/') == 1:
-                            urls.add(clean_url)
-                            if len(urls) >= config.PROFILES_TO_SCRAPE:
-                                break
-                except Exception as e:
-                    print(f"Error processing a link element: {e}")
-            
-            print(f"Collected {len(urls)} unique URLs so far.")
+                continue
+            for url in links:
+                if url not in urls and url not in known:
+                    urls.append(url)
 
-            if len(urls) >= config.PROFILES_TO_SCRAPE:
-                break
-            
-            try:
-                next_button = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Next']")
-                if not next_button.is_enabled():
-                    print("Reached the last page of results.")
-                    break
-                
-                self.driver.execute_script("arguments[0].click();", next_button)
-                page_number += 1
-                time.sleep(3)
-            except NoSuchElementException:
-                print("Could not find the 'Next' button. Reached the end of results.")
-                break
-
-        self.profile_urls = list(urls)[:config.PROFILES_TO_SCRAPE]
+        self.profile_urls = urls[:limit]
         print(f"\nFinished URL collection. Total unique profiles found: {len(self.profile_urls)}")
+        if known:
+            print(f"[INFO] Skipped {len(known)} profiles scraped in earlier runs.")
+
+    def _scrape_profile(self, url):
+        self.watchdog.page_loaded(1 + len(DETAIL_KINDS) if config.SCRAPE_MODE == "DETAILED" else 1)
+        if self._captures_html():
+            captured = capture_profile_pages(self.driver, url)
+            if self.snapshots:
+                self.snapshots.record_capture(captured)
+            return captured
+        # Fingerprinting costs a full scroll of the profile, which only pays off for a
+        # profile scraped before; with SKIP_SEEN_PROFILES most URLs are new.
+        fingerprints = self.fingerprints if self.seen is None or url in self.seen else None
+        return extract_profile_data(self.driver, url, fingerprints)
+
+    def _print_profile(self, i, total, profile_data):
+        if self.quiet:
+            print(f"[SUCCESS] Profile {i+1}/{total}: {profile_data.get('name') or 'N/A'} ({profile_data.get('url')})")
+            return
+
+        print("\n" + "="*80)
+        print(f"[INFO] Scraped profile {i+1}/{total}")
+        print("="*80)
+        print(f"URL: {profile_data.get('url')}")
+
+        print("\n" + "-"*80)
+        print("SCRAPED DATA:")
+        print("-"*80)
+        print(f"Name:       {profile_data.get('name', 'N/A')}")
+        print(f"Headline:   {profile_data.get('headline', 'N/A')}")
+        print(f"Location:   {profile_data.get('location', 'N/A')}")
+
+        if profile_data.get('experience'):
+            print(f"\nExperience:")
+            exp_items = profile_data.get('experience').split(' | ')
+            for idx, exp in enumerate(exp_items, 1):
+                print(f"  {idx}. {exp}")
+        else:
+            print(f"\nExperience: No data extracted")
+
+        if profile_data.get('education'):
+            print(f"\nEducation:")
+            edu_items = profile_data.get('education').split(' | ')
+            for idx, edu in enumerate(edu_items, 1):
+                print(f"  {idx}. {edu}")
+        else:
+            print(f"\nEducation:  No data extracted")
+
+        if profile_data.get('skills'):
+            print(f"\nSkills:")
+            skill_items = profile_data.get('skills').split(' | ')
+            skills_in_columns = [skill_items[i:i + 2] for i in range(0, len(skill_items), 2)]
+            for row in skills_in_columns:
+                print(f"  - {row[0]:<40} {('- ' + row[1]) if len(row) > 1 else ''}")
+        else:
+            print(f"\nSkills:     No data extracted")
+
+        print("-"*80)
+        print(f"[SUCCESS] Profile {i+1}/{total} completed")
+        print("="*80)
+
+    def _record_profile(self, total, profile_data):
+        # A profile without a name failed to extract. It is still written out, but left
+        # pending in the journal and out of the seen index, so later runs try it again.
+        if profile_data.get("name"):
+            METRICS.increment("profiles_scraped")
+            self.journal.record_profile(profile_data)
+            if self.seen is not None:
+                self.seen.add(profile_data["url"])
+        else:
+            METRICS.increment("profiles_empty")
+        self.output.add(self._positions[profile_data["url"]], profile_data)
+        self._done += 1
+        self._print_profile(self._done - 1, total, profile_data)
+
+    def _scrape_over_http(self, urls, total):
+        from http_fetch import HttpProfileFetcher, has_required_fields
+
+        try:
+            fetcher = HttpProfileFetcher(config.COOKIES_FILENAME, config.HTTP_CONCURRENCY)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] HTTP fast path disabled: {e}")
+            return urls
 
+        def fetch(url):
+            try:
+                return fetcher.scrape(url)
+            except Exception as e:
+                print(f"[WARNING] HTTP fetch failed for {url}: {e}")
+                return None
+
+        print(f"[INFO] Fetching {len(urls)} profiles over HTTP with {config.HTTP_CONCURRENCY} connection(s)...")
+        fallback = []
+        try:
+            with ThreadPoolExecutor(max_workers=config.HTTP_CONCURRENCY) as executor:
+                for url, profile_data in zip(urls, executor.map(fetch, urls)):
+                    if profile_data is not None and has_required_fields(profile_data):
+                        METRICS.increment("http_profiles")
+                        self._record_profile(total, profile_data)
+                    else:
+                        METRICS.increment("http_fallbacks")
+                        fallback.append(url)
+        finally:
+            fetcher.close()
+        print(f"[INFO] HTTP fast path scraped {len(urls) - len(fallback)} profiles. {len(fallback)} left for the browser.")
+        return fallback
+
+    def _open_output(self, filename):
+        self._positions = {url: position for position, url in enumerate(self.profile_urls)}
+        self.output = OrderedWriter(open_sink(config.OUTPUT_FORMAT, filename, config.OUTPUT_BATCH_SIZE), config.OUTPUT_MAX_HELD_BACK)
+        # Profiles finished earlier (previous run or earlier batch job) are written first, in their original positions.
+        for profile_data in self.journal.profiles_in_order():
+            self.output.add(self._positions[profile_data["url"]], profile_data)
+
+    def _collect_or_resume_urls(self, search_url, resume):
+        if resume:
+            self.profile_urls = self.journal.load_urls()
+            if self.profile_urls:
+                journal_search_url = self.journal.search_url()
+                if journal_search_url != search_url:
+                    print(f"[WARNING] Resuming a run for a different search: {journal_search_url}")
+                print(f"[INFO] Resuming run with {len(self.profile_urls)} collected URLs.")
+                return
+            print("[WARNING] Nothing to resume. Starting a new run.")
+
+        self.journal.reset(search_url)
+        self._get_profile_urls(config.SEARCH_KEYWORDS, config.LOCATION)
+        self.journal.save_urls(self.profile_urls)
+
+    def _scrape_collected(self, output_filename):
+        completed = self.journal.completed_urls()
+        remaining = [url for url in self.profile_urls if url not in completed]
+        if completed and len(remaining) < len(self.profile_urls):
+            print(f"[INFO] Skipping {len(self.profile_urls) - len(remaining)} profiles that were already scraped.")
+
+        self._open_output(output_filename)
+        total = len(remaining)
+        self._done = 0
+        parse_executor = None
+        if self._captures_html():
+            # Parser processes must not be forked from a process whose worker threads may hold
+            # locks (metrics, limiter, stdout); a forkserver starts them from a clean process.
+            parse_executor = ProcessPoolExecutor(max_workers=config.PARSE_PROCESSES, mp_context=multiprocessing.get_context(_PARSE_START_METHOD))
+        try:
+            if config.HTTP_FAST_PATH and config.SCRAPE_MODE != "DETAILED":
+                remaining = self._scrape_over_http(remaining, total)
+            print(f"\n[INFO] Scraping {len(remaining)} profiles with {config.WORKERS} worker(s)...")
+            self.pool.run(
+                self,
+                remaining,
+                on_result=lambda i, profile_data: self._record_profile(total, profile_data),
+                parse_executor=parse_executor,
+                on_give_up=lambda i, url: self.output.skip(self._positions[url]),
+            )
+        finally:
+            if parse_executor:
+                parse_executor.shutdown()
+
+        self.output.close()
+        print(f"\n[SUCCESS] Successfully saved {self.output.sink.count} profiles to '{output_filename}'")
+        self.output = None
+
+    def _export_metrics(self):
+        try:
+            METRICS.export(config.METRICS_JSON_FILENAME, config.METRICS_PROMETHEUS_FILENAME)
+        except OSError as e:
+            print(f"[WARNING] Could not write metrics: {e}")
+            return
+        METRICS.print_summary()
+        print(f"[INFO] Metrics written to '{config.METRICS_JSON_FILENAME}' and '{config.METRICS_PROMETHEUS_FILENAME}'.")
+
+    def _begin_run(self, journal_filename, quiet):
+        self.quiet = quiet
+        METRICS.reset()
+        LIMITER.reset()
+        self.journal = RunJournal(journal_filename)
+        self.pool = ScraperPool(config.WORKERS)
+        REGISTRY.load(config.SELECTOR_STATS_FILENAME)
+        if config.SKIP_SEEN_PROFILES:
+            self.seen = SeenIndex(
+                config.SEEN_INDEX_FILENAME,
+                config.SEEN_BLOOM_FILENAME,
+                config.SEEN_INDEX_CAPACITY,
+                config.SEEN_INDEX_ERROR_RATE,
+            )
+        if config.CHANGE_DETECTION:
+            self.fingerprints = FingerprintStore(config.FINGERPRINT_FILENAME)
+        if config.SNAPSHOT_MODE == "RECORD":
+            self.snapshots = SnapshotStore(config.SNAPSHOT_ARCHIVE)
+            print(f"[INFO] Recording page snapshots to '{config.SNAPSHOT_ARCHIVE}'.")
+
+    def _end_run(self):
+        if self.output:
+            self.output.close()
+            print(f"[INFO] Saved {self.output.sink.count} profiles to '{self.output.sink.path}' before stopping.")
+            self.output = None
+        self.pool.close()
+        self._export_metrics()
+        REGISTRY.save(config.SELECTOR_STATS_FILENAME)
+        REGISTRY.print_report()
+        self.journal.close()
+        if self.seen is not None:
+            self.seen.close()
+        if self.fingerprints is not None:
+            self.fingerprints.close()
+        if self.snapshots:
+            self.snapshots.close()
+        if self.driver:
+            print("[INFO] Closing browser.")
+            self.driver.quit()
 
-    def scrape_profiles(self):
+    def scrape_profiles(self, resume=False, quiet=False):
         search_url = build_search_url(config.SEARCH_KEYWORDS, config.LOCATION)
-        self._setup_driver()
-        
+        self._begin_run(config.JOURNAL_FILENAME, quiet)
         try:
-            self.driver.get("https://www.linkedin.com/")
-            if not self._load_cookies():
+            if not self._start_session():
                 return
             
-            self._get_profile_urls(search_url)
+            self._collect_or_resume_urls(search_url, resume)
             
             if not self.profile_urls:
                 print("No profile URLs were collected. Exiting.")
                 return
 
-            profiles_data = []
-            for i, url in enumerate(self.profile_urls):
-                print("\n" + "="*80)
-                print(f"[INFO] Scraping profile {i+1}/{len(self.profile_urls)}")
-                print("="*80)
-                print(f"URL: {url}")
-                
-                self.driver.get(url)
-                time.sleep(5)
-                
-                profile_data = extract_profile_data(self.driver, url)
-                
-                print("\n" + "-"*80)
-                print("SCRAPED DATA:")
-                print("-"*80)
-                print(f"Name:       {profile_data.get('name', 'N/A')}")
-                print(f"Headline:   {profile_data.get('headline', 'N/A')}")
-                print(f"Location:   {profile_data.get('location', 'N/A')}")
-                
-                if profile_data.get('experience'):
-                    print(f"\nExperience:")
-                    exp_items = profile_data.get('experience').split(' | ')
-                    for idx, exp in enumerate(exp_items, 1):
-                        print(f"  {idx}. {exp}")
-                else:
-                    print(f"\nExperience: No data extracted")
-                
-                if profile_data.get('education'):
-                    print(f"\nEducation:")
-                    edu_items = profile_data.get('education').split(' | ')
-                    for idx, edu in enumerate(edu_items, 1):
-                        print(f"  {idx}. {edu}")
-                else:
-                    print(f"\nEducation:  No data extracted")
-
-                if profile_data.get('skills'):
-                    print(f"\nSkills:")
-                    skill_items = profile_data.get('skills').split(' | ')
-                    skills_in_columns = [skill_items[i:i + 2] for i in range(0, len(skill_items), 2)]
-                    for row in skills_in_columns:
-                        print(f"  - {row[0]:<40} {('- ' + row[1]) if len(row) > 1 else ''}")
-                else:
-                    print(f"\nSkills:     No data extracted")
-                
-                print("-"*80)
-                print(f"[SUCCESS] Profile {i+1}/{len(self.profile_urls)} completed")
-                print("="*80)
-                
-                profiles_data.append(profile_data)
-                time.sleep(2)
-            
-            df = pd.DataFrame(profiles_data)
-            df.to_csv(config.OUTPUT_FILENAME, index=False)
-            print(f"\n[SUCCESS] Successfully saved {len(profiles_data)} profiles to '{config.OUTPUT_FILENAME}'")
+            self._scrape_collected(config.OUTPUT_FILENAME)
 
         except Exception as e:
             print(f"[ERROR] An error occurred: {e}")
-            self._save_debug_info(self.driver, "debug_fatal_error")
+            print(f"[INFO] Finished profiles are kept in '{config.JOURNAL_FILENAME}'. Run 'python main.py scrape --resume' to continue.")
+            if self.driver:
+                self._save_debug_info(self.driver, "debug_fatal_error")
         finally:
+            self._end_run()
+
+    def _write_aggregate(self, urls, filename):
+        profiles = self.journal.profiles_by_url()
+        sink = open_sink(config.OUTPUT_FORMAT, filename, config.OUTPUT_BATCH_SIZE)
+        for url in urls:
+            if url in profiles:
+                sink.write(profiles[url])
+        sink.close()
+        print(f"[SUCCESS] Saved {sink.count} unique profiles from all jobs to '{filename}'")
+
+    def scrape_jobs(self, jobs, aggregate_filename, resume=False, quiet=False):
+        # All jobs share one journal, so a profile found by several searches is only scraped once,
+        # and the same browsers, which stay open in the pool between jobs.
+        self._begin_run(config.BATCH_JOURNAL_FILENAME, quiet)
+        aggregate_urls = []
+        try:
+            if not self._start_session():
+                return
+
+            finished = self.journal.finished_jobs() if resume else {}
+            if not resume:
+                self.journal.reset("batch")
+            elif finished:
+                print(f"[INFO] Resuming batch. {len(finished)} of {len(jobs)} jobs are already done.")
+
+            for number, job in enumerate(jobs, 1):
+                print(f"\n[INFO] Job {number}/{len(jobs)} '{job['name']}': '{job['keywords']}' in {job['location']}")
+                if job["name"] in finished:
+                    print(f"[INFO] Job '{job['name']}' finished in a previous run. Skipping.")
+                    self.profile_urls = finished[job["name"]]
+                else:
+                    self.profile_urls = self.journal.load_urls() if resume and self.journal.current_job() == job["name"] else []
+                    if self.profile_urls:
+                        print(f"[INFO] Resuming job '{job['name']}' with {len(self.profile_urls)} collected URLs.")
+                    else:
+                        self._get_profile_urls(job["keywords"], job["location"], job["profiles"], self.journal.completed_urls())
+                        self.journal.start_job(job["name"], self.profile_urls)
+                    self._scrape_collected(job["output"])
+                    self.journal.finish_job(job["name"], self.profile_urls)
+                seen = set(aggregate_urls)
+                aggregate_urls.extend(url for url in self.profile_urls if url not in seen)
+
+            self._write_aggregate(aggregate_urls, aggregate_filename)
+
+        except Exception as e:
+            print(f"[ERROR] An error occurred: {e}")
+            print(f"[INFO] Finished jobs and profiles are kept in '{config.BATCH_JOURNAL_FILENAME}'. Run 'python main.py batch <jobs file> --resume' to continue.")
             if self.driver:
-                print("[INFO] Closing browser.")
-                self.driver.quit()
+                self._save_debug_info(self.driver, "debug_fatal_error")
+        finally:
+            self._end_run()
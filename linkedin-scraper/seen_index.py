@@ -0,0 +1,81 @@
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import threading
+import time
+
+
+# URLs of every profile scraped so far. A Bloom filter in a memory-mapped file
+# answers most "never seen" lookups without touching SQLite; a "maybe seen" is
+# confirmed against the exact table, so false positives never skip a profile.
+class SeenIndex:
+    def __init__(self, path, bloom_path, capacity, error_rate):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY, scraped_at REAL NOT NULL) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        self.conn.commit()
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._open_bloom(bloom_path)
+
+    def _open_bloom(self, bloom_path):
+        size = (self.bits + 7) // 8
+        params = f"{self.bits}:{self.hashes}"
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'bloom'").fetchone()
+        rebuild = not os.path.exists(bloom_path) or os.path.getsize(bloom_path) != size or not row or row[0] != params
+        with open(bloom_path, "a+b") as f:
+            f.truncate(size)
+        self._file = open(bloom_path, "r+b")
+        self._bloom = mmap.mmap(self._file.fileno(), size)
+        if rebuild:
+            self._rebuild(params)
+
+    def _rebuild(self, params):
+        # Sizing changed or the filter file is missing: refill it from the exact table.
+        self._bloom[:] = bytes(len(self._bloom))
+        count = 0
+        for (url,) in self.conn.execute("SELECT url FROM seen"):
+            self._set_bits(url)
+            count += 1
+        self._bloom.flush()
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('bloom', ?)", (params,))
+        if count:
+            print(f"[INFO] Rebuilt the seen-URL filter from {count} stored URLs.")
+
+    def _positions(self, url):
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def _set_bits(self, url):
+        for position in self._positions(url):
+            self._bloom[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, url):
+        with self._lock:
+            if not all(self._bloom[position >> 3] & (1 << (position & 7)) for position in self._positions(url)):
+                return False
+            return self.conn.execute("SELECT 1 FROM seen WHERE url = ?", (url,)).fetchone() is not None
+
+    def add(self, url):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO seen (url, scraped_at) VALUES (?, ?)", (url, time.time()))
+            self._set_bits(url)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        self._bloom.flush()
+        self._bloom.close()
+        self._file.close()
+        self.conn.close()
@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from selenium.webdriver.common.by import By
+import config
+
+# Fallback chains for every element the WebDriver extractors look up, most precise
+# first. Lookups use find_elements, so a miss costs one round trip and no exception.
+# An "item.lines" entry is a (title, subtitle) pair read from the same list item.
+SELECTORS = {
+    "search.profile_links": [
+        (By.CSS_SELECTOR, "a[data-test-app-aware-link][href*='/in/']"),
+        (By.XPATH, "//a[contains(@href, '/in/')]"),
+    ],
+    "profile.name": [
+        (By.CSS_SELECTOR, "h1.text-heading-xlarge"),
+        (By.XPATH, "//main//h1"),
+    ],
+    "profile.headline": [(By.CSS_SELECTOR, "div.text-body-medium.break-words")],
+    "profile.location": [(By.CSS_SELECTOR, "span.text-body-small.inline")],
+    "summary.items": [(By.CSS_SELECTOR, "li.artdeco-list__item")],
+    "summary.skill_names": [(By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']")],
+    "details.items": [(By.CSS_SELECTOR, "li.pvs-list__paged-list-item")],
+    "item.lines": [
+        (
+            (By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']"),
+            (By.CSS_SELECTOR, "span.t-14.t-normal span[aria-hidden='true']"),
+        ),
+        (
+            (By.XPATH, "(.//span[@aria-hidden='true'])[1]"),
+            (By.XPATH, "(.//span[@aria-hidden='true'])[2]"),
+        ),
+    ],
+}
+
+
+def _key(selector):
+    # Pairs are counted under their title selector.
+    how, what = selector[0] if isinstance(selector[0], tuple) else selector
+    return f"{how}={what}"
+
+
+# Tries the selectors of a chain in their declared order, except that one which
+# missed `demote_after` times in a row goes to the back of the chain, so a layout
+# change costs a few failed lookups instead of one per element and profile. A demoted
+# selector is tried first again every `retry_every` lookups, in case the markup came back.
+# Hit counts are kept per selector and saved between runs.
+class SelectorRegistry:
+    def __init__(self, selectors, demote_after=5, retry_every=100):
+        self.selectors = selectors
+        self.demote_after = demote_after
+        self.retry_every = retry_every
+        self.stats = {}
+        self._lookups = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except FileNotFoundError:
+            stats = {}
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not read selector statistics from '{path}': {e}")
+            stats = {}
+        with self._lock:
+            self.stats = stats
+
+    def save(self, path):
+        with self._lock:
+            data = json.dumps(self.stats, indent=2, sort_keys=True)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"[WARNING] Could not write selector statistics to '{path}': {e}")
+
+    def _entry(self, name, selector):
+        return self.stats.setdefault(name, {}).setdefault(
+            _key(selector), {"hits": 0, "misses": 0, "miss_streak": 0, "last_hit": 0}
+        )
+
+    def _record(self, name, selector, hit):
+        with self._lock:
+            entry = self._entry(name, selector)
+            if hit:
+                entry["hits"] += 1
+                entry["miss_streak"] = 0
+                entry["last_hit"] = time.time()
+            else:
+                entry["misses"] += 1
+                entry["miss_streak"] += 1
+
+    def _demoted(self, name, selector):
+        entry = self.stats.get(name, {}).get(_key(selector))
+        return bool(entry) and entry["miss_streak"] >= self.demote_after
+
+    def ordered(self, name):
+        chain = self.selectors[name]
+        with self._lock:
+            lookups = self._lookups[name] = self._lookups.get(name, 0) + 1
+            if lookups % self.retry_every == 0:
+                return list(chain)
+            demoted = [self._demoted(name, selector) for selector in chain]
+        order = sorted(range(len(chain)), key=lambda i: (demoted[i], i))
+        return [chain[i] for i in order]
+
+    def find_all(self, root, name):
+        for selector in self.ordered(name):
+            elements = root.find_elements(*selector)
+            self._record(name, selector, bool(elements))
+            if elements:
+                return elements
+        return []
+
+    def lines(self, root, name="item.lines", subtitle=True):
+        # Title and subtitle of a list item, both from the same entry of the chain.
+        for title_selector, subtitle_selector in self.ordered(name):
+            titles = root.find_elements(*title_selector)
+            self._record(name, (title_selector, subtitle_selector), bool(titles))
+            if titles:
+                subtitles = root.find_elements(*subtitle_selector) if subtitle else []
+                return titles[0].text.strip(), subtitles[0].text.strip() if subtitles else ""
+        return "", ""
+
+    def find(self, root, name):
+        elements = self.find_all(root, name)
+        return elements[0] if elements else None
+
+    def text(self, root, name):
+        element = self.find(root, name)
+        return element.text.strip() if element is not None else ""
+
+    def dead_selectors(self, min_streak):
+        # A selector is dead when it was demoted behind a fallback, or, without a
+        # fallback, when it keeps missing. Selectors removed from SELECTORS are ignored.
+        dead = []
+        for name, chain in self.selectors.items():
+            threshold = self.demote_after if len(chain) > 1 else min_streak
+            with self._lock:
+                known = self.stats.get(name, {})
+                for selector in chain:
+                    entry = known.get(_key(selector))
+                    if not entry or not entry["miss_streak"]:
+                        continue
+                    if entry["miss_streak"] >= threshold:
+                        dead.append((name, _key(selector), entry))
+        return dead
+
+    def print_report(self):
+        for name, selector, entry in self.dead_selectors(config.SELECTOR_DEAD_AFTER):
+            print(
+                f"[WARNING] Selector for '{name}' stopped matching after {entry['hits']} hits "
+                f"({entry['miss_streak']} misses in a row): {selector}"
+            )
+
+
+REGISTRY = SelectorRegistry(SELECTORS, config.SELECTOR_DEMOTE_AFTER, config.SELECTOR_RETRY_EVERY)
@@ -0,0 +1,329 @@
+import getpass
+import json
+import os
+import signal
+import sys
+import time
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.firefox.options import Options
+import config
+from metrics import span
+from procmem import pid_alive
+from throttle import is_logged_out_url
+from utils import navigate
+
+# One XHR against the logged-in API instead of a full page load.
+_SESSION_CHECK_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const match = document.cookie.match(/JSESSIONID="?([^";]+)/);
+fetch("/voyager/api/me", {credentials: "include", headers: {"csrf-token": match ? match[1] : ""}})
+    .then(response => done({status: response.status, url: response.url}))
+    .catch(error => done({status: 0, url: "", error: String(error)}));
+"""
+
+
+def session_is_valid(driver):
+    if not driver.current_url.startswith(config.BASE_URL):
+        navigate(driver, config.BASE_URL)
+    try:
+        with span("session.check"):
+            result = driver.execute_async_script(_SESSION_CHECK_SCRIPT)
+    except WebDriverException as e:
+        print(f"[WARNING] Could not check the LinkedIn session: {e}")
+        return False
+    if is_logged_out_url(result.get("url", "")):
+        return False
+    return 200 <= result.get("status", 0) < 300
+
+
+def _read_session_file():
+    try:
+        with open(config.SESSION_FILENAME, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _slot_path(index):
+    return f"{config.SESSION_FILENAME}.slot{index}.lock"
+
+
+def _recycle_path(index):
+    # Left by a scraper whose watchdog wants this warm browser replaced.
+    return f"{config.SESSION_FILENAME}.slot{index}.recycle"
+
+
+def _claim_slot(index):
+    path = _slot_path(index)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(path, "r") as f:
+                    owner = int(f.read() or 0)
+            except (OSError, ValueError):
+                owner = 0
+            if owner and pid_alive(owner):
+                return None
+            # Left behind by a process that died without releasing it.
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return path
+    return None
+
+
+def _release_slot(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class AttachedFirefox(webdriver.Remote):
+    # Drives a browser owned by the session daemon instead of starting a new one.
+    # `driver_pid` is the daemon's geckodriver, so the watchdog can measure the browser.
+    def __init__(self, executor_url, session_id, slot_path, index=None, driver_pid=None):
+        self._attach_session_id = session_id
+        self.slot_path = slot_path
+        self.index = index
+        self.driver_pid = driver_pid
+        super().__init__(command_executor=executor_url, options=Options())
+
+    def start_session(self, capabilities):
+        self.session_id = self._attach_session_id
+        self.caps = {"browserName": "firefox"}
+
+    def quit(self):
+        # The browser stays warm for the next run; only give the slot back.
+        _release_slot(self.slot_path)
+
+    def request_recycle(self):
+        # The daemon replaces the browser before anyone attaches to it again.
+        if self.index is not None:
+            with open(_recycle_path(self.index), "w") as f:
+                f.write(str(os.getpid()))
+
+
+def attach_to_session():
+    info = _read_session_file()
+    if not info or not pid_alive(info.get("pid", 0)):
+        return None
+
+    for index, entry in enumerate(info.get("sessions", [])):
+        if os.path.exists(_recycle_path(index)):
+            continue
+        slot_path = _claim_slot(index)
+        if slot_path is None:
+            continue
+        try:
+            driver = AttachedFirefox(entry["executor_url"], entry["session_id"], slot_path, index, entry.get("driver_pid"))
+            driver.current_url
+            print(f"[INFO] Attached to warm browser session {index}.")
+            return driver
+        except Exception as e:
+            print(f"[WARNING] Warm browser session {index} is not reachable: {e}")
+            _release_slot(slot_path)
+    return None
+
+
+class SessionDaemon:
+    def __init__(self, slots, credentials=None):
+        self.slots = max(1, slots)
+        self.credentials = credentials
+        self.drivers = []
+        self._stopping = False
+        # Slot index -> time.monotonic() before which a failed replacement is not tried again.
+        self._retry_at = {}
+
+    def _launch(self):
+        from scraper import LinkedInScraper
+
+        scraper = LinkedInScraper()
+        scraper._launch_driver()
+        try:
+            navigate(scraper.driver, config.BASE_URL)
+            scraper._load_cookies()
+            if not self._ensure_authenticated(scraper.driver):
+                raise RuntimeError("the browser is not logged in to LinkedIn")
+        except Exception:
+            scraper.driver.quit()
+            raise
+        return scraper.driver
+
+    def _ensure_authenticated(self, driver):
+        if session_is_valid(driver):
+            return True
+        print("[INFO] LinkedIn session is not authenticated. Logging in again...")
+        if not self.credentials:
+            print("[ERROR] No credentials available. Set LINKEDIN_USERNAME and LINKEDIN_PASSWORD or run 'python main.py login'.")
+            return False
+        from auth import LinkedInAuth
+
+        return LinkedInAuth(*self.credentials).login(driver=driver)
+
+    def _write_session_file(self):
+        info = {
+            "pid": os.getpid(),
+            "sessions": [
+                {
+                    "executor_url": driver.service.service_url,
+                    "session_id": driver.session_id,
+                    "driver_pid": driver.service.process.pid,
+                }
+                if driver is not None
+                else {"executor_url": None, "session_id": None, "driver_pid": None}
+                for driver in self.drivers
+            ],
+        }
+        with open(config.SESSION_FILENAME, "w") as f:
+            json.dump(info, f, indent=2)
+
+    def _replace(self, index):
+        # Returns False if no new browser could be started. The slot then stays marked for
+        # recycling, so no scrape attaches to it, and is tried again after SESSION_CHECK_INTERVAL.
+        try:
+            self.drivers[index].quit()
+        except Exception:
+            pass
+        self.drivers[index] = None
+        try:
+            self.drivers[index] = self._launch()
+        except Exception as e:
+            print(f"[ERROR] Could not start browser {index}: {e}. Retrying in {config.SESSION_CHECK_INTERVAL}s.")
+            with open(_recycle_path(index), "w") as f:
+                f.write(str(os.getpid()))
+            self._retry_at[index] = time.monotonic() + config.SESSION_CHECK_INTERVAL
+            return False
+        finally:
+            self._write_session_file()
+        self._retry_at.pop(index, None)
+        return True
+
+    def _check(self, index):
+        if os.path.exists(_recycle_path(index)):
+            # Replaced by _recycle_requested().
+            return
+        slot_path = _claim_slot(index)
+        if slot_path is None:
+            # A scrape is using this browser right now.
+            return
+        try:
+            try:
+                authenticated = self._ensure_authenticated(self.drivers[index])
+            except WebDriverException as e:
+                print(f"[WARNING] Browser {index} died ({e}). Starting a new one...")
+                self._replace(index)
+                return
+            if not authenticated:
+                print(f"[WARNING] Browser {index} is logged out. Starting a new one...")
+                self._replace(index)
+        finally:
+            _release_slot(slot_path)
+
+    def _recycle_requested(self, index):
+        if not os.path.exists(_recycle_path(index)):
+            return
+        if time.monotonic() < self._retry_at.get(index, 0):
+            return
+        slot_path = _claim_slot(index)
+        if slot_path is None:
+            return
+        try:
+            if index not in self._retry_at:
+                print(f"[INFO] Browser {index} was recycled by a scrape. Starting a new one...")
+            if self._replace(index):
+                os.remove(_recycle_path(index))
+        finally:
+            _release_slot(slot_path)
+
+    def _stop(self, signum, frame):
+        self._stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        try:
+            for index in range(self.slots):
+                print(f"[INFO] Starting warm browser {index + 1}/{self.slots}...")
+                try:
+                    self.drivers.append(self._launch())
+                except Exception as e:
+                    print(f"[ERROR] Could not start warm browser {index + 1}: {e}")
+                    return
+            self._write_session_file()
+            print(f"[SUCCESS] Session daemon running (pid {os.getpid()}). Stop it with 'python main.py session stop'.")
+
+            next_check = time.monotonic() + config.SESSION_CHECK_INTERVAL
+            while not self._stopping:
+                time.sleep(1)
+                for index in range(len(self.drivers)):
+                    self._recycle_requested(index)
+                if time.monotonic() >= next_check:
+                    for index in range(len(self.drivers)):
+                        self._check(index)
+                    next_check = time.monotonic() + config.SESSION_CHECK_INTERVAL
+        finally:
+            info = _read_session_file()
+            if info and info.get("pid") == os.getpid():
+                os.remove(config.SESSION_FILENAME)
+            for driver in self.drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            print("[INFO] Session daemon stopped.")
+
+
+def _credentials():
+    username = os.environ.get("LINKEDIN_USERNAME")
+    password = os.environ.get("LINKEDIN_PASSWORD")
+    if username and password:
+        return username, password
+    if sys.stdin.isatty():
+        print("Credentials are only used if the saved session expires. Leave empty to skip.")
+        username = input("Enter your LinkedIn username or email: ")
+        password = getpass.getpass("Enter your LinkedIn password: ") if username else ""
+        if username and password:
+            return username, password
+    return None
+
+
+def start_daemon():
+    info = _read_session_file()
+    if info and pid_alive(info.get("pid", 0)):
+        print(f"[ERROR] A session daemon is already running (pid {info['pid']}).")
+        return
+    SessionDaemon(config.SESSION_SLOTS, _credentials()).run()
+
+
+def stop_daemon():
+    info = _read_session_file()
+    if not info or not pid_alive(info.get("pid", 0)):
+        print("[INFO] No session daemon is running.")
+        return
+    os.kill(info["pid"], signal.SIGTERM)
+    print(f"[SUCCESS] Sent stop signal to session daemon (pid {info['pid']}).")
+
+
+def print_status():
+    info = _read_session_file()
+    if not info or not pid_alive(info.get("pid", 0)):
+        print("[INFO] No session daemon is running.")
+        return
+    print(f"Session daemon: running (pid {info['pid']})")
+    for index, entry in enumerate(info.get("sessions", [])):
+        if os.path.exists(_recycle_path(index)):
+            state = "being replaced"
+        else:
+            state = "in use" if os.path.exists(_slot_path(index)) else "idle"
+        if entry["session_id"] is None:
+            print(f"  Browser {index}: {state} (not running)")
+        else:
+            print(f"  Browser {index}: {state} ({entry['executor_url']}, session {entry['session_id']})")
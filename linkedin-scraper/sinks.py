@@ -0,0 +1,187 @@
+import abc
+import csv
+import json
+import os
+
+PROFILE_FIELDS = ["url", "name", "headline", "location", "experience", "education", "skills"]
+
+
+class _BatchedSink:
+    def __init__(self, path, batch_size):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._batch = []
+
+    def write(self, row):
+        self._batch.append({field: row.get(field, "") for field in PROFILE_FIELDS})
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._batch:
+            self._write_batch(self._batch)
+            self._batch = []
+
+    def close(self):
+        self.flush()
+
+
+class _AppendFileSink(_BatchedSink, abc.ABC):
+    def __init__(self, path, batch_size):
+        super().__init__(path, batch_size)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._start()
+
+    def _start(self):
+        pass
+
+    @abc.abstractmethod
+    def _write_rows(self, rows):
+        pass
+
+    def _write_batch(self, rows):
+        # Whole rows only, synced to disk, so an interrupted run leaves a valid file.
+        self._write_rows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class CsvSink(_AppendFileSink):
+    def _start(self):
+        self._writer = csv.DictWriter(self._file, fieldnames=PROFILE_FIELDS, lineterminator="\n")
+        self._writer.writeheader()
+        self._file.flush()
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+
+
+class JsonlSink(_AppendFileSink):
+    def _write_rows(self, rows):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+
+
+class ParquetSink(_BatchedSink):
+    # A Parquet file is only readable once its footer is written, so every batch
+    # becomes a complete part file inside the `path` directory.
+    def __init__(self, path, batch_size):
+        super().__init__(path, batch_size)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("part-") and name.endswith(".parquet"):
+                os.remove(os.path.join(path, name))
+        self._parts = 0
+
+    def _write_batch(self, rows):
+        table = self._pa.Table.from_pylist(rows, schema=self._pa.schema([(field, self._pa.string()) for field in PROFILE_FIELDS]))
+        part_path = os.path.join(self.path, f"part-{self._parts:05d}.parquet")
+        self._pq.write_table(table, part_path + ".tmp")
+        os.replace(part_path + ".tmp", part_path)
+        self._parts += 1
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_sink(output_format, path, batch_size):
+    try:
+        sink_class = SINKS[output_format.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{output_format}'. Choose one of: {', '.join(SINKS)}")
+    return sink_class(path, batch_size)
+
+
+def format_for_path(path):
+    if os.path.isdir(path) or path.endswith(".parquet"):
+        return "parquet"
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension not in SINKS:
+        raise ValueError(f"Cannot tell the format of '{path}'. Use a .csv, .jsonl or .parquet path.")
+    return extension
+
+
+def read_rows(path):
+    output_format = format_for_path(path)
+    if output_format == "csv":
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif output_format == "jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Reading Parquet requires pyarrow. Install it with: pip install pyarrow")
+        for name in sorted(os.listdir(path)):
+            if name.startswith("part-") and name.endswith(".parquet"):
+                yield from pyarrow.parquet.read_table(os.path.join(path, name)).to_pylist()
+
+
+def count_rows(path):
+    return sum(1 for _ in read_rows(path))
+
+
+_SKIPPED = object()
+
+
+class OrderedWriter:
+    # Holds back results that finish early so rows are written in URL order. Positions
+    # that will never arrive must be passed to skip(). If more than `max_held` rows are
+    # waiting anyway, the oldest are written out of order rather than kept in memory.
+    def __init__(self, sink, max_held=1000):
+        self.sink = sink
+        self.max_held = max(1, max_held)
+        self._next = 0
+        self._pending = {}
+
+    def add(self, position, row):
+        if position < self._next:
+            # Arrived after its gap was given up on.
+            self.sink.write(row)
+            return
+        self._pending[position] = row
+        self._drain()
+
+    def skip(self, position):
+        if position >= self._next:
+            self._pending[position] = _SKIPPED
+            self._drain()
+
+    def _drain(self):
+        while True:
+            while self._next in self._pending:
+                row = self._pending.pop(self._next)
+                if row is not _SKIPPED:
+                    self.sink.write(row)
+                self._next += 1
+            if len(self._pending) <= self.max_held:
+                return
+            print(f"[WARNING] Row {self._next} has not arrived after {self.max_held} later rows; writing them without it.")
+            self._next = min(self._pending)
+
+    def close(self):
+        for position in sorted(self._pending):
+            if self._pending[position] is not _SKIPPED:
+                self.sink.write(self._pending[position])
+        self._pending.clear()
+        self.sink.close()
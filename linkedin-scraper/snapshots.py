@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+import time
+import zlib
+from utils import DETAIL_KINDS, details_url_for
+
+
+class SnapshotStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                captured_at REAL NOT NULL,
+                html BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_by_url ON snapshots (url, captured_at);
+            CREATE INDEX IF NOT EXISTS snapshots_by_kind ON snapshots (kind);
+            """
+        )
+        # Pages recorded together by record_capture share the id of their profile row.
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(snapshots)")}
+        if "capture" not in columns:
+            self.conn.execute("ALTER TABLE snapshots ADD COLUMN capture INTEGER")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS snapshots_by_capture ON snapshots (capture, url)")
+        self.conn.commit()
+
+    def record(self, url, kind, page_source, capture=None):
+        compressed = zlib.compress(page_source.encode("utf-8"), 6)
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO snapshots (url, kind, captured_at, html, capture) VALUES (?, ?, ?, ?, ?)",
+                (url, kind, time.time(), compressed, capture),
+            )
+        return cursor.lastrowid
+
+    def record_capture(self, captured):
+        if captured.get("profile") is None:
+            # Detail pages without their profile page can never be replayed.
+            return
+        capture = self.record(captured["url"], "profile", captured["profile"])
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE snapshots SET capture = ? WHERE id = ?", (capture, capture))
+        for kind, page_source in (captured.get("details") or {}).items():
+            if page_source is not None:
+                self.record(details_url_for(captured["url"], kind), kind, page_source, capture)
+
+    def latest(self, url):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT html FROM snapshots WHERE url = ? ORDER BY captured_at DESC LIMIT 1",
+                (url,),
+            ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def urls(self, kind):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT url FROM snapshots WHERE kind = ? GROUP BY url ORDER BY MIN(id)",
+                (kind,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _capture_details(self, url, profile_id, capture):
+        details = {}
+        with self._lock:
+            for kind in DETAIL_KINDS:
+                details_url = details_url_for(url, kind)
+                if capture is not None:
+                    row = self.conn.execute(
+                        "SELECT html FROM snapshots WHERE capture = ? AND url = ?", (capture, details_url)
+                    ).fetchone()
+                else:
+                    # Archives recorded before captures were tagged: detail pages are written
+                    # right after their profile page and before the next capture of that profile.
+                    row = self.conn.execute(
+                        """
+                        SELECT html FROM snapshots WHERE url = ? AND id > ? AND id < COALESCE(
+                            (SELECT MIN(id) FROM snapshots WHERE url = ? AND kind = 'profile' AND id > ?),
+                            (SELECT MAX(id) + 1 FROM snapshots)
+                        ) ORDER BY id LIMIT 1
+                        """,
+                        (details_url, profile_id, url, profile_id),
+                    ).fetchone()
+                details[kind] = zlib.decompress(row[0]).decode("utf-8") if row else None
+        return details
+
+    def load_capture(self, url):
+        # The latest profile page, with the detail pages recorded in the same capture only.
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, html, capture FROM snapshots WHERE url = ? AND kind = 'profile' ORDER BY id DESC LIMIT 1",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return {"url": url, "profile": None, "details": None}
+        profile_id, html, capture = row
+        captured = {"url": url, "profile": zlib.decompress(html).decode("utf-8"), "details": None}
+        details = self._capture_details(url, profile_id, capture)
+        if any(page_source is not None for page_source in details.values()):
+            captured["details"] = details
+        return captured
+
+    def close(self):
+        self.conn.close()
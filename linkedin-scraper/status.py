@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import time
+import config
+from procmem import pid_alive
+from sinks import count_rows
+
+# Everything here reads files directly, so 'python main.py status' starts in
+# milliseconds and never launches a browser.
+
+
+def _age(seconds):
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            value = int(seconds // size)
+            return f"{value} {unit}{'s' if value != 1 else ''}"
+    return "less than a minute"
+
+
+def _query(path, sql):
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return conn.execute(sql).fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def _print_cookies():
+    path = config.COOKIES_FILENAME
+    try:
+        with open(path, "r") as f:
+            cookies = json.load(f)
+    except FileNotFoundError:
+        print(f"Cookies:        missing ('{path}'). Run 'python main.py login'.")
+        return
+    except (OSError, ValueError) as e:
+        print(f"Cookies:        unreadable ('{path}'): {e}")
+        return
+
+    saved = f"saved {_age(time.time() - os.path.getmtime(path))} ago"
+    session_cookie = next((cookie for cookie in cookies if cookie.get("name") == "li_at"), None)
+    if session_cookie is None:
+        print(f"Cookies:        {saved}, but without a LinkedIn session cookie (li_at). Log in again.")
+    elif "expiry" not in session_cookie:
+        print(f"Cookies:        {saved}, session cookie present")
+    elif session_cookie["expiry"] <= time.time():
+        print(f"Cookies:        {saved}, session cookie EXPIRED. Run 'python main.py login'.")
+    else:
+        print(f"Cookies:        {saved}, session cookie expires in {_age(session_cookie['expiry'] - time.time())}")
+
+
+def _print_session():
+    try:
+        with open(config.SESSION_FILENAME, "r") as f:
+            info = json.load(f)
+    except (FileNotFoundError, ValueError):
+        info = None
+    if info and pid_alive(info.get("pid", 0)):
+        print(f"Warm session:   daemon running (pid {info['pid']}, {len(info.get('sessions', []))} browsers)")
+    else:
+        print("Warm session:   not running")
+
+
+def _print_output():
+    path = config.OUTPUT_FILENAME
+    if not os.path.exists(path):
+        print(f"Output:         '{path}' not written yet")
+        return
+    try:
+        rows = count_rows(path)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Output:         '{path}' unreadable: {e}")
+        return
+    print(f"Output:         '{path}', {rows} profiles, written {_age(time.time() - os.path.getmtime(path))} ago")
+
+
+def _print_journal():
+    collected = _query(config.JOURNAL_FILENAME, "SELECT COUNT(*) FROM urls")
+    if collected is None:
+        print("Last run:       no journal")
+        return
+    done = _query(config.JOURNAL_FILENAME, "SELECT COUNT(*) FROM profiles") or 0
+    search_url = _query(config.JOURNAL_FILENAME, "SELECT value FROM run WHERE key = 'search_url'")
+    print(f"Last run:       {done}/{collected} profiles scraped ({search_url})")
+    if done < collected:
+        print("                unfinished, continue with 'python main.py scrape --resume'")
+
+
+def print_status():
+    _print_cookies()
+    _print_session()
+    _print_output()
+    _print_journal()
+    seen = _query(config.SEEN_INDEX_FILENAME, "SELECT COUNT(*) FROM seen")
+    print(f"Known profiles: {seen or 0}")
+    if os.path.exists(config.METRICS_JSON_FILENAME):
+        print(f"Metrics:        '{config.METRICS_JSON_FILENAME}', written {_age(time.time() - os.path.getmtime(config.METRICS_JSON_FILENAME))} ago")
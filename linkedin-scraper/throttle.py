@@ -0,0 +1,66 @@
+import threading
+import time
+from urllib.parse import urlsplit
+import config
+from metrics import METRICS, span
+
+# LinkedIn sends throttled or logged-out clients to one of these pages.
+LOGGED_OUT_MARKERS = ("/login", "/authwall", "/checkpoint", "/uas")
+
+
+def is_logged_out_url(url):
+    # Matched on whole leading path segments, so a profile like /in/login-smith does not count.
+    path = urlsplit(url).path
+    return any(path == marker or path.startswith(marker + "/") for marker in LOGGED_OUT_MARKERS)
+
+
+# Token bucket shared by every worker thread. The rate grows slowly while pages
+# load fast and is cut sharply on slow pages, timeouts and checkpoint redirects.
+class AdaptiveRateLimiter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.rate = config.THROTTLE_START_RATE
+            self.tokens = float(config.THROTTLE_BURST)
+            self.updated = time.monotonic()
+            self.paused_until = 0.0
+            self.latency = None
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(config.THROTTLE_BURST, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Taking a token the bucket does not have yet reserves the next one,
+            # so waiting threads are released one interval apart.
+            self.tokens -= 1
+            delay = max(-self.tokens / self.rate, self.paused_until - now, 0)
+        if delay:
+            with span("throttle.wait"):
+                time.sleep(delay)
+
+    def record(self, latency, url=""):
+        if is_logged_out_url(url):
+            self.back_off(f"redirected to {url}")
+            return
+        with self._lock:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if self.latency > config.THROTTLE_SLOW_LATENCY:
+                self.rate = max(config.THROTTLE_MIN_RATE, self.rate * 0.8)
+            else:
+                self.rate = min(config.THROTTLE_MAX_RATE, self.rate + config.THROTTLE_RATE_STEP)
+
+    def back_off(self, reason):
+        with self._lock:
+            self.rate = max(config.THROTTLE_MIN_RATE, self.rate / 2)
+            self.paused_until = max(self.paused_until, time.monotonic() + config.THROTTLE_COOLDOWN)
+            self.tokens = min(self.tokens, 0.0)
+            rate = self.rate
+        METRICS.increment("throttle_backoffs")
+        print(f"[WARNING] Slowing down to {rate:.2f} pages/s for {config.THROTTLE_COOLDOWN}s: {reason}")
+
+
+LIMITER = AdaptiveRateLimiter()
@@ -1,10 +1,15 @@
+import time
 import config
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from waits import wait_for_dom_quiet, scroll_until_stable
+from page_script import extract_details_script, extract_profile_fields_script, profile_fingerprint
+from metrics import METRICS, span, timed
+from selector_registry import REGISTRY
+from throttle import LIMITER
 
 COUNTRY_TO_GEO_URN = {
     "france": "105015875",
@@ -36,50 +41,129 @@ COUNTRY_TO_GEO_URN = {
     "us": "103644278",
 }
 
+DETAIL_KINDS = ("experience", "education", "skills")
+
 def _get_geo_urn(location: str):
     if not location:
         return None
     key = location.strip().lower()
     return COUNTRY_TO_GEO_URN.get(key)
 
-def build_search_url(keywords, location):
+def build_search_url(keywords, location, page=1):
     encoded_keywords = quote(keywords)
-    base = f"https://www.linkedin.com/search/results/people/?keywords={encoded_keywords}&origin=GLOBAL_SEARCH_HEADER"
+    url = f"{config.BASE_URL.rstrip('/')}/search/results/people/?keywords={encoded_keywords}&origin=GLOBAL_SEARCH_HEADER"
     geo_urn = _get_geo_urn(location)
     if geo_urn:
-        return f"{base}&geoUrn=%5B%22{geo_urn}%22%5D"
-    return base
-
-def extract_experience_details(driver, experience_url):
-    driver.get(experience_url)
+        url = f"{url}&geoUrn=%5B%22{geo_urn}%22%5D"
+    if page > 1:
+        url = f"{url}&page={page}"
+    return url
+
+def clean_profile_url(href):
+    if href and '/in/' in href and '/search/' not in href:
+        clean_url = href.split('?')[0]
+        if clean_url.count('/in/') == 1:
+            return clean_url
+    return None
+
+def navigate(driver, url):
+    LIMITER.acquire()
+    started = time.monotonic()
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "li.pvs-list__paged-list-item"))
+        with span("navigate"):
+            driver.get(url)
+    except TimeoutException:
+        LIMITER.back_off(f"page load timed out: {url}")
+        raise
+    LIMITER.record(time.monotonic() - started, driver.current_url)
+
+def start_navigation(driver, url):
+    # Unlike driver.get, this returns immediately and lets the page load in the background.
+    # Returns the start time for page_load_seconds().
+    LIMITER.acquire()
+    with span("navigate.start"):
+        driver.execute_script("window.location.href = arguments[0];", url)
+    return time.monotonic()
+
+def page_load_seconds(driver, started):
+    # Pages in tabs load side by side, so the time since start_navigation also counts reading
+    # the other tabs; the page's own navigation timing is used when the browser reports it.
+    try:
+        duration = driver.execute_script(
+            "const entry = performance.getEntriesByType('navigation')[0]; return entry ? entry.duration : 0;"
         )
+    except WebDriverException:
+        duration = 0
+    return duration / 1000 if duration else time.monotonic() - started
+
+def open_profile_page(driver, url):
+    try:
+        # navigate() has already slowed the limiter down; a slow page is not a worker crash.
+        navigate(driver, url)
+    except TimeoutException:
+        print(f"[WARNING] Profile page timed out: {url}")
+        return False
+    try:
+        with span("wait.profile_h1"):
+            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1")))
+        wait_for_dom_quiet(driver)
+    except TimeoutException:
+        print(f"[WARNING] Main profile page did not load correctly: {url}")
+        LIMITER.back_off(f"profile did not render: {url}")
+        return False
+    return True
+
+def open_details_page(driver, details_url, kind):
+    try:
+        navigate(driver, details_url)
     except TimeoutException:
-        print(f"[INFO] No experience found or page did not load: {experience_url}")
+        print(f"[INFO] {kind.capitalize()} page timed out: {details_url}")
+        return False
+    return wait_for_details_page(driver, details_url, kind)
+
+def wait_for_details_page(driver, details_url, kind):
+    try:
+        with span("wait.details_list"):
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "li.pvs-list__paged-list-item"))
+            )
+    except TimeoutException:
+        print(f"[INFO] No {kind} found or page did not load: {details_url}")
+        return False
+
+    if kind == "experience":
+        scroll_until_stable(driver, "li.pvs-list__paged-list-item")
+    return True
+
+def details_page_loaded(driver, details_url):
+    # A section without entries still renders its page; a timeout, error page or login wall does not.
+    try:
+        return (
+            urlsplit(driver.current_url).path.rstrip('/') == urlsplit(details_url).path.rstrip('/')
+            and driver.execute_script("return document.readyState") == "complete"
+            and bool(driver.find_elements(By.CSS_SELECTOR, "main"))
+        )
+    except WebDriverException:
+        return False
+
+@timed("extract.experience_details")
+def extract_experience_details(driver, experience_url):
+    if not open_details_page(driver, experience_url, "experience"):
         return []
+    return read_experience_details(driver)
 
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
+def read_experience_details(driver):
+    if config.EXTRACTION_MODE == "SCRIPT":
+        return extract_details_script(driver, "experience")
 
     experience_list = []
     try:
-        exp_items = driver.find_elements(By.CSS_SELECTOR, "li.pvs-list__paged-list-item")
+        exp_items = REGISTRY.find_all(driver, "details.items")
         for item in exp_items:
             try:
-                spans = item.find_elements(By.CSS_SELECTOR, "span[aria-hidden='true']")
-                if not spans:
+                job_title, company = REGISTRY.lines(item)
+                if not job_title:
                     continue
-
-                job_title = spans[0].text.strip()
-                company = spans[1].text.strip() if len(spans) > 1 else ""
                 
                 full_text = f"{job_title} at {company}" if company else job_title
                 experience_list.append(full_text)
@@ -90,28 +174,24 @@ def extract_experience_details(driver, experience_url):
         
     return experience_list[:5]
 
+@timed("extract.education_details")
 def extract_education_details(driver, education_url):
-    driver.get(education_url)
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "li.pvs-list__paged-list-item"))
-        )
-    except TimeoutException:
-        print(f"[INFO] No education found or page did not load: {education_url}")
+    if not open_details_page(driver, education_url, "education"):
         return []
+    return read_education_details(driver)
+
+def read_education_details(driver):
+    if config.EXTRACTION_MODE == "SCRIPT":
+        return extract_details_script(driver, "education")
 
     education_list = []
     try:
-        edu_items = driver.find_elements(By.CSS_SELECTOR, "li.pvs-list__paged-list-item")
+        edu_items = REGISTRY.find_all(driver, "details.items")
         for item in edu_items:
             try:
-                institution = item.find_element(By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']").text.strip()
-                
-                degree = ""
-                try:
-                    degree = item.find_element(By.CSS_SELECTOR, "span.t-14.t-normal span[aria-hidden='true']").text.strip()
-                except NoSuchElementException:
-                    pass
+                institution, degree = REGISTRY.lines(item)
+                if not institution:
+                    continue
 
                 full_text = f"{institution} - {degree}" if degree else institution
                 education_list.append(full_text)
@@ -122,22 +202,22 @@ def extract_education_details(driver, education_url):
 
     return education_list[:5]
 
+@timed("extract.skills_details")
 def extract_skills_details(driver, skills_url):
-    driver.get(skills_url)
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "li.pvs-list__paged-list-item"))
-        )
-    except TimeoutException:
-        print(f"[INFO] No skills found or page did not load: {skills_url}")
+    if not open_details_page(driver, skills_url, "skills"):
         return []
+    return read_skills_details(driver)
+
+def read_skills_details(driver):
+    if config.EXTRACTION_MODE == "SCRIPT":
+        return extract_details_script(driver, "skills")
 
     skills_list = []
     try:
-        skill_items = driver.find_elements(By.CSS_SELECTOR, "li.pvs-list__paged-list-item")
+        skill_items = REGISTRY.find_all(driver, "details.items")
         for item in skill_items:
             try:
-                skill_name = item.find_element(By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']").text.strip()
+                skill_name, _ = REGISTRY.lines(item, subtitle=False)
                 if skill_name:
                     skills_list.append(skill_name)
             except Exception:
@@ -147,76 +227,57 @@ def extract_skills_details(driver, skills_url):
 
     return skills_list[:10]
 
+@timed("extract.summary_experience")
 def extract_summary_experience(driver):
     experience_list = []
     try:
         experience_heading = driver.find_element(By.XPATH, "//h2[contains(., 'Experience')]")
         experience_section = experience_heading.find_element(By.XPATH, "./ancestor::section")
-        experience_items = experience_section.find_elements(By.CSS_SELECTOR, 'li.artdeco-list__item')
+        experience_items = REGISTRY.find_all(experience_section, "summary.items")
         
         for item in experience_items:
             try:
-                title_element = item.find_element(By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']")
-                title = title_element.text.strip()
-
-                company_element = item.find_element(By.CSS_SELECTOR, "span.t-14.t-normal span[aria-hidden='true']")
-                company = company_element.text.strip()
-                
-                full_text = f"{title} at {company}" if company else title
-                experience_list.append(full_text)
-            except NoSuchElementException:
-                try:
-                    spans = item.find_elements(By.CSS_SELECTOR, "span[aria-hidden='true']")
-                    if spans:
-                        title = spans[0].text.strip()
-                        company = spans[1].text.strip() if len(spans) > 1 else ""
-                        full_text = f"{title} at {company}" if company else title
-                        if full_text not in experience_list:
-                           experience_list.append(full_text)
-                except Exception:
+                title, company = REGISTRY.lines(item)
+                if not title:
                     continue
+                full_text = f"{title} at {company}" if company else title
+                if full_text not in experience_list:
+                    experience_list.append(full_text)
+            except Exception:
+                continue
     except NoSuchElementException:
         print("[INFO] Summary experience section not found on main page.")
     return experience_list[:5]
 
+@timed("extract.summary_education")
 def extract_summary_education(driver):
     education_list = []
     try:
         education_heading = driver.find_element(By.XPATH, "//h2[contains(., 'Education')]")
         education_section = education_heading.find_element(By.XPATH, "./ancestor::section")
-        education_items = education_section.find_elements(By.CSS_SELECTOR, 'li.artdeco-list__item')
+        education_items = REGISTRY.find_all(education_section, "summary.items")
 
         for item in education_items:
             try:
-                institution_element = item.find_element(By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']")
-                institution = institution_element.text.strip()
-
-                degree_element = item.find_element(By.CSS_SELECTOR, "span.t-14.t-normal span[aria-hidden='true']")
-                degree = degree_element.text.strip()
-
-                full_text = f"{institution} - {degree}" if degree else institution
-                education_list.append(full_text)
-            except NoSuchElementException:
-                try:
-                    spans = item.find_elements(By.CSS_SELECTOR, "span[aria-hidden='true']")
-                    if spans:
-                        institution = spans[0].text.strip()
-                        degree = spans[1].text.strip() if len(spans) > 1 else ""
-                        full_text = f"{institution} - {degree}" if degree else institution
-                        if full_text not in education_list:
-                            education_list.append(full_text)
-                except Exception:
+                institution, degree = REGISTRY.lines(item)
+                if not institution:
                     continue
+                full_text = f"{institution} - {degree}" if degree else institution
+                if full_text not in education_list:
+                    education_list.append(full_text)
+            except Exception:
+                continue
     except NoSuchElementException:
         print("[INFO] Summary education section not found on main page.")
     return education_list[:5]
 
+@timed("extract.summary_skills")
 def extract_summary_skills(driver):
     skills_list = []
     try:
         skills_heading = driver.find_element(By.XPATH, "//h2[contains(., 'Skills')]")
         skills_section = skills_heading.find_element(By.XPATH, "./ancestor::section")
-        skill_items = skills_section.find_elements(By.CSS_SELECTOR, "div.hoverable-link-text span[aria-hidden='true']")
+        skill_items = REGISTRY.find_all(skills_section, "summary.skill_names")
         
         for item in skill_items:
             skills_list.append(item.text.strip())
@@ -224,68 +285,125 @@ def extract_summary_skills(driver):
          print("[INFO] Summary skills section not found on main page.")
     return skills_list[:10]
 
-def extract_profile_data(driver, url):
+@timed("extract.top_card")
+def extract_top_card(driver, url, data):
+    for key in ("name", "headline", "location"):
+        element = REGISTRY.find(driver, f"profile.{key}")
+        if element is None:
+            print(f"[WARNING] Could not extract {key} for {url}")
+        else:
+            data[key] = element.text.strip()
+    return data
+
+def details_url_for(url, kind):
+    return url.rstrip('/') + f'/details/{kind}/'
+
+@timed("details.tabs")
+def visit_details_in_tabs(driver, url, read, loaded=None):
+    # All detail pages start loading at once in their own tabs, then are read one by one,
+    # so the profile pays for roughly one page load instead of three. Kinds whose page
+    # loaded, with or without entries, are added to `loaded`.
+    main_handle = driver.current_window_handle
+    tabs = {}
+    started = {}
+    results = {}
+    try:
+        for kind in DETAIL_KINDS:
+            driver.switch_to.new_window('tab')
+            tabs[kind] = driver.current_window_handle
+            started[kind] = start_navigation(driver, details_url_for(url, kind))
+
+        for kind, handle in tabs.items():
+            driver.switch_to.window(handle)
+            details_url = details_url_for(url, kind)
+            found = wait_for_details_page(driver, details_url, kind)
+            # Like navigate(), every tab reports its load time, or backs the limiter off.
+            if found or details_page_loaded(driver, details_url):
+                LIMITER.record(page_load_seconds(driver, started[kind]), driver.current_url)
+                if loaded is not None:
+                    loaded.add(kind)
+            else:
+                LIMITER.back_off(f"{kind} page did not load: {driver.current_url}")
+            if found:
+                results[kind] = read(driver, kind)
+    finally:
+        for handle in tabs.values():
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except WebDriverException:
+                pass
+        driver.switch_to.window(main_handle)
+    return results
+
+@timed("extract.details")
+def read_details(driver, kind):
+    return DETAIL_READERS[kind](driver)
+
+@timed("extract.profile")
+def extract_profile_data(driver, url, fingerprints=None):
     data = {"url": url, "name": "", "headline": "", "location": "", "experience": "", "education": "", "skills": ""}
     
     print(f"[INFO] Scraping main profile page for top card...")
-    driver.get(url)
-    try:
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1")))
-        time.sleep(3)
-    except TimeoutException:
-        print(f"[WARNING] Main profile page did not load correctly: {url}")
+    if not open_profile_page(driver, url):
         return data
 
-    try:
-        data["name"] = driver.find_element(By.CSS_SELECTOR, "h1.text-heading-xlarge").text.strip()
-    except NoSuchElementException:
-        try:
-             data["name"] = driver.find_element(By.XPATH, "//main//h1").text.strip()
-        except NoSuchElementException:
-            print(f"[WARNING] Could not extract name for {url}")
-
-    try:
-        data["headline"] = driver.find_element(By.CSS_SELECTOR, "div.text-body-medium.break-words").text.strip()
-    except NoSuchElementException:
-        print(f"[WARNING] Could not extract headline for {url}")
+    fingerprint = None
+    if fingerprints is not None and config.SCRAPE_MODE == "DETAILED":
+        # The summary sections are lazy-loaded and part of the fingerprint.
+        scroll_until_stable(driver, "section li.artdeco-list__item")
+        fingerprint = profile_fingerprint(driver)
+        stored = fingerprints.unchanged(url, fingerprint, config.SCRAPE_MODE)
+        if stored is not None:
+            print("[INFO] Profile unchanged since the last scrape. Reusing the stored record.")
+            METRICS.increment("profiles_unchanged")
+            return stored
+
+    if config.EXTRACTION_MODE == "SCRIPT":
+        extract_profile_fields_script(driver, url, data)
+        if config.SCRAPE_MODE != "DETAILED":
+            return data
+    else:
+        extract_top_card(driver, url, data)
 
-    try:
-        data["location"] = driver.find_element(By.CSS_SELECTOR, "span.text-body-small.inline").text.strip()
-    except NoSuchElementException:
-        print(f"[WARNING] Could not extract location for {url}")
+    loaded = set()
+    if config.SCRAPE_MODE == "DETAILED" and config.DETAIL_TABS:
+        print("[INFO] Running in DETAILED mode (detail pages in parallel tabs).")
+        for kind, items in visit_details_in_tabs(driver, url, read_details, loaded).items():
+            if items:
+                data[kind] = " | ".join(items)
 
-    if config.SCRAPE_MODE == "DETAILED":
+    elif config.SCRAPE_MODE == "DETAILED":
         print("[INFO] Running in DETAILED mode.")
         experience_url = url.rstrip('/') + '/details/experience/'
         print(f"[INFO] Navigating to experience page...")
         experience_list = extract_experience_details(driver, experience_url)
         if experience_list:
             data["experience"] = " | ".join(experience_list)
+        if experience_list or details_page_loaded(driver, experience_url):
+            loaded.add("experience")
 
         education_url = url.rstrip('/') + '/details/education/'
         print(f"[INFO] Navigating to education page...")
         education_list = extract_education_details(driver, education_url)
         if education_list:
             data["education"] = " | ".join(education_list)
+        if education_list or details_page_loaded(driver, education_url):
+            loaded.add("education")
 
         skills_url = url.rstrip('/') + '/details/skills/'
         print(f"[INFO] Navigating to skills page...")
         skills_list = extract_skills_details(driver, skills_url)
         if skills_list:
             data["skills"] = " | ".join(skills_list)
+        if skills_list or details_page_loaded(driver, skills_url):
+            loaded.add("skills")
     
     else:
         print("[INFO] Running in SUMMARY mode.")
         print("[INFO] Scrolling to load all page content...")
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        while True:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-        
+        scroll_until_stable(driver, "section li.artdeco-list__item")
+
         experience_list = extract_summary_experience(driver)
         if experience_list:
             data["experience"] = " | ".join(experience_list)
@@ -298,5 +416,40 @@ def extract_profile_data(driver, url):
         if skills_list:
             data["skills"] = " | ".join(skills_list)
 
-
+    # A detail page that failed to load leaves a gap that reusing the record would keep
+    # forever, so records are only stored when every detail page loaded.
+    if fingerprint is not None and data["name"] and loaded.issuperset(DETAIL_KINDS):
+        fingerprints.store(url, fingerprint, config.SCRAPE_MODE, data)
     return data
+
+@timed("capture.profile")
+def capture_profile_pages(driver, url):
+    captured = {"url": url, "profile": None, "details": None}
+
+    print(f"[INFO] Capturing main profile page...")
+    if not open_profile_page(driver, url):
+        return captured
+
+    if config.SCRAPE_MODE == "DETAILED":
+        captured["profile"] = driver.page_source
+        if config.DETAIL_TABS:
+            captured["details"] = visit_details_in_tabs(driver, url, lambda tab, kind: tab.page_source)
+            return captured
+        captured["details"] = {}
+        for kind in DETAIL_KINDS:
+            details_url = details_url_for(url, kind)
+            print(f"[INFO] Navigating to {kind} page...")
+            if open_details_page(driver, details_url, kind):
+                captured["details"][kind] = driver.page_source
+    else:
+        print("[INFO] Scrolling to load all page content...")
+        scroll_until_stable(driver, "section li.artdeco-list__item")
+        captured["profile"] = driver.page_source
+
+    return captured
+
+DETAIL_READERS = {
+    "experience": read_experience_details,
+    "education": read_education_details,
+    "skills": read_skills_details,
+}
@@ -0,0 +1,63 @@
+import time
+import config
+from metrics import timed
+
+# Resolves once no DOM mutation has been observed for `quietMs`, or with
+# `false` when `timeoutMs` elapses first.
+_DOM_QUIET_SCRIPT = """
+const [quietMs, timeoutMs, scroll, selector, done] = arguments;
+if (scroll) {
+    window.scrollTo(0, document.body.scrollHeight);
+}
+let quietTimer = null;
+let hardTimer = null;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+function finish(settled) {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done({
+        settled: settled,
+        height: document.body.scrollHeight,
+        count: selector ? document.querySelectorAll(selector).length : 0,
+    });
+}
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+hardTimer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+
+def _run_settle_script(driver, timeout, scroll=False, selector=None, quiet_ms=None):
+    quiet_ms = config.DOM_QUIET_MS if quiet_ms is None else quiet_ms
+    timeout_ms = int(timeout * 1000)
+    # The async script must be allowed to outlive its own hard timeout.
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(_DOM_QUIET_SCRIPT, quiet_ms, timeout_ms, scroll, selector)
+
+
+@timed("wait.dom_quiet")
+def wait_for_dom_quiet(driver, timeout=None, quiet_ms=None):
+    timeout = config.WAIT_TIMEOUT if timeout is None else timeout
+    result = _run_settle_script(driver, timeout, quiet_ms=quiet_ms)
+    return bool(result and result.get("settled"))
+
+
+@timed("scroll")
+def scroll_until_stable(driver, item_selector=None, timeout=None, quiet_ms=None):
+    timeout = config.SCROLL_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    last = None
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print("[INFO] Scrolling stopped at the time limit; page may still be loading.")
+            return False
+        result = _run_settle_script(driver, remaining, scroll=True, selector=item_selector, quiet_ms=quiet_ms)
+        current = (result["height"], result["count"])
+        if current == last:
+            return True
+        last = current
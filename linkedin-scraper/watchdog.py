@@ -0,0 +1,28 @@
+import config
+from metrics import METRICS, span
+from procmem import browser_rss
+
+
+# Decides when a worker's browser has done enough work and should be replaced.
+# Firefox keeps growing over hundreds of heavy profile pages, so a fresh browser
+# every so often is cheaper than letting it swap or crash mid-run.
+class DriverWatchdog:
+    def __init__(self):
+        self.pages = 0
+
+    def reset(self):
+        self.pages = 0
+
+    def page_loaded(self, count=1):
+        self.pages += count
+
+    def recycle_reason(self, driver):
+        if config.RECYCLE_AFTER_PAGES and self.pages >= config.RECYCLE_AFTER_PAGES:
+            return f"{self.pages} pages loaded"
+        if config.RECYCLE_RSS_MB:
+            with span("watchdog.rss"):
+                rss_mb = browser_rss(driver) / 1024 / 1024
+            if rss_mb >= config.RECYCLE_RSS_MB:
+                METRICS.increment("driver_recycles_rss")
+                return f"browser uses {rss_mb:.0f} MB"
+        return None